@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Documentation Generator Benchmark
+Synthesizes crawl trees of a given size and shape and times each phase of
+generate_site.py (crawl data scan, hierarchy building, rendering, HTML output).
+Runs fully offline and writes machine-readable results as JSON.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import resource
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import generate_site
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Share of pages generated for each crawl source format
+SHAPES = {
+    "mixed": {
+        "csv": 0.35,
+        "metadata": 0.15,
+        "summary_new": 0.1,
+        "summary_old": 0.05,
+        "teamdynamix": 0.1,
+        "dropbox": 0.05,
+        "markdown": 0.2,
+    },
+    "csv": {"csv": 1.0},
+    "markdown": {"markdown": 0.7, "teamdynamix": 0.3},
+    "json": {"metadata": 0.4, "summary_new": 0.3, "summary_old": 0.1, "dropbox": 0.2},
+}
+
+# Largest number of pages written to a single synthetic site
+PAGES_PER_SITE = 5000
+
+WORDS = (
+    "extension agriculture soil water crop cattle poultry forestry budget payroll "
+    "benefits training grant research farm pest peanut cotton turfgrass nutrition "
+    "policy form guide report meeting county agent travel purchasing account"
+).split()
+
+
+def make_title(rng):
+    return " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 6)))
+
+
+def make_path(rng, depth):
+    """Random URL path with `depth` directory segments and a page slug"""
+    parts = [rng.choice(WORDS) for _ in range(depth)]
+    parts.append(f"{rng.choice(WORDS)}-{rng.randrange(10**6)}")
+    return "/".join(parts)
+
+
+def split_sites(count):
+    """Split a page count into per-site page counts of at most PAGES_PER_SITE"""
+    sizes = []
+    while count > 0:
+        sizes.append(min(count, PAGES_PER_SITE))
+        count -= sizes[-1]
+    return sizes
+
+
+def write_csv_site(site_dir, rng, pages, max_depth):
+    host = f"https://{site_dir.name}.caes.uga.edu"
+    with open(site_dir / "crawl_inventory.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "URL",
+                "Title",
+                "Depth",
+                "Local File",
+                "Crawl Date",
+                "Status Code",
+                "Content Type",
+            ]
+        )
+        for i in range(pages):
+            depth = rng.randint(0, max_depth)
+            writer.writerow(
+                [
+                    f"{host}/{make_path(rng, depth)}",
+                    make_title(rng),
+                    str(depth),
+                    f"docs/{site_dir.name}/page-{i}.md",
+                    "2025-09-01T10:00:00Z",
+                    "200",
+                    "text/html",
+                ]
+            )
+
+
+def write_metadata_site(site_dir, rng, pages, max_depth):
+    host = f"https://{site_dir.name}.uga.edu"
+    files = [
+        {
+            "filename": f"page-{i}.md",
+            "url": f"{host}/{make_path(rng, rng.randint(0, max_depth))}",
+            "title": make_title(rng),
+        }
+        for i in range(pages)
+    ]
+    metadata = {"baseUrl": host, "crawledAt": "2025-08-01T00:00:00Z", "files": files}
+    (site_dir / "_metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+
+def write_summary_site(site_dir, rng, pages, max_depth, old_format=False):
+    host = f"https://{site_dir.name}.caes.uga.edu"
+    if old_format:
+        files = [f"docs/{site_dir.name}/{make_path(rng, 0)}.md" for _ in range(pages)]
+    else:
+        files = [
+            {
+                "url": f"{host}/{make_path(rng, rng.randint(0, max_depth))}",
+                "title": make_title(rng),
+                "filepath": f"docs/{site_dir.name}/page-{i}.md",
+            }
+            for i in range(pages)
+        ]
+    summary = {"crawl_date": "2025-07-01T00:00:00", "base_url": host, "files": files}
+    (site_dir / "crawl_summary.json").write_text(json.dumps(summary), encoding="utf-8")
+
+
+def write_teamdynamix(docs_dir, rng, pages):
+    """TeamDynamix folder groups: one category markdown file per 50 articles"""
+    base = docs_dir / "teamdynamix"
+    base.mkdir(parents=True, exist_ok=True)
+    groups = {}
+    article = 0
+    for group_no, group_pages in enumerate(split_sites(pages)):
+        group = f"group_{group_no}"
+        (base / group).mkdir(exist_ok=True)
+        categories = {}
+        for category_no in range(0, group_pages, 50):
+            count = min(50, group_pages - category_no)
+            file_name = f"category-{category_no}.md"
+            lines = [
+                "---",
+                "source: TeamDynamix Knowledge Base",
+                f"title: {make_title(rng)}",
+                "---",
+                "",
+            ]
+            for _ in range(count):
+                article += 1
+                lines += [
+                    f"### {make_title(rng)}",
+                    "",
+                    f"**Link:** https://uga.teamdynamix.com/TDClient/KB/ArticleDet?ID={article}",
+                    "",
+                    " ".join(rng.choice(WORDS) for _ in range(40)),
+                    "",
+                ]
+            (base / group / file_name).write_text("\n".join(lines), encoding="utf-8")
+            categories[f"{group}-{category_no}"] = {
+                "name": make_title(rng),
+                "file": f"{group}/{file_name}",
+            }
+        groups[group] = {"categories": categories}
+
+    summary = {
+        "structure": "folders",
+        "crawled": "2025-05-05T00:00:00",
+        "groups": groups,
+    }
+    (base / "crawl_summary.json").write_text(json.dumps(summary), encoding="utf-8")
+
+
+def write_dropbox(docs_dir, rng, pages):
+    site_dir = docs_dir / "dropbox" / "intranet-files"
+    site_dir.mkdir(parents=True, exist_ok=True)
+    folders = ["hr_forms", "finance", "training", "policies"]
+    files = [
+        {
+            "title": make_title(rng),
+            "share_url": f"https://www.dropbox.com/s/{rng.randrange(10**9):x}/doc-{i}.pdf",
+            "output_path": f"docs/dropbox/intranet-files/doc-{i}.md",
+            "folder": rng.choice(folders),
+        }
+        for i in range(pages)
+    ]
+    summary = {"processed_at": "2025-04-04T00:00:00Z", "processed_files": files}
+    (site_dir / "api_processing_summary.json").write_text(
+        json.dumps(summary), encoding="utf-8"
+    )
+
+
+def write_markdown_site(site_dir, rng, pages, max_depth):
+    """Raw markdown with front matter, as in wordpress-uploads-processed"""
+    for i in range(pages):
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(50, 400)))
+        url = f"https://caes.uga.edu/wp-content/uploads/{make_path(rng, rng.randint(0, max_depth))}.pdf"
+        (site_dir / f"upload-{i}.md").write_text(
+            f"---\ntitle: {make_title(rng)}\nurl: {url}\n---\n\n{body}\n",
+            encoding="utf-8",
+        )
+
+
+def synthesize_tree(docs_dir, pages, shape="mixed", max_depth=4, seed=0):
+    """Write a synthetic crawl tree with roughly `pages` pages to docs_dir"""
+    rng = random.Random(seed)
+    docs_dir = Path(docs_dir)
+    docs_dir.mkdir(parents=True, exist_ok=True)
+
+    for kind, share in SHAPES[shape].items():
+        count = round(pages * share)
+        if count == 0:
+            continue
+        if kind == "teamdynamix":
+            write_teamdynamix(docs_dir, rng, count)
+            continue
+        if kind == "dropbox":
+            write_dropbox(docs_dir, rng, count)
+            continue
+
+        for site_no, site_pages in enumerate(split_sites(count)):
+            if kind == "markdown":
+                site_dir = (
+                    docs_dir / "wordpress-uploads-processed" / f"uploads-{site_no}"
+                )
+            else:
+                site_dir = docs_dir / f"bench-{kind.replace('_', '-')}-{site_no}"
+            site_dir.mkdir(parents=True, exist_ok=True)
+
+            if kind == "csv":
+                write_csv_site(site_dir, rng, site_pages, max_depth)
+            elif kind == "metadata":
+                write_metadata_site(site_dir, rng, site_pages, max_depth)
+            elif kind == "summary_new":
+                write_summary_site(site_dir, rng, site_pages, max_depth)
+            elif kind == "summary_old":
+                write_summary_site(
+                    site_dir, rng, site_pages, max_depth, old_format=True
+                )
+            elif kind == "markdown":
+                write_markdown_site(site_dir, rng, site_pages, max_depth)
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process so far, in KiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def timed(phases, name, func, *args):
+    """Run func(*args), recording wall time and peak RSS under phases[name]"""
+    start = time.perf_counter()
+    result = func(*args)
+    phases[name] = {
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+    return result
+
+
+def render_all(hierarchies):
+    """Render every site hierarchy into a throwaway sink, returning characters written"""
+    written = 0
+
+    def write(chunk):
+        nonlocal written
+        written += len(chunk)
+
+    for site_name, hierarchy in hierarchies.items():
+        generate_site.render_hierarchy(hierarchy, site_name, write, lambda page: "")
+    return written
+
+
+def run_benchmark(docs_dir, output_dir, workers=1):
+    """Time each generator phase against an existing crawl tree"""
+    phases = {}
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sites = timed(
+        phases,
+        "read_crawl_data",
+        generate_site.read_crawl_data,
+        docs_dir,
+        None,
+        workers,
+    )
+    hierarchies = timed(
+        phases,
+        "build_hierarchy",
+        lambda: {
+            name: generate_site.build_hierarchy(data["pages"])
+            for name, data in sites.items()
+        },
+    )
+    timed(phases, "render_hierarchy", render_all, hierarchies)
+    del hierarchies
+
+    output_file = output_dir / "index.html"
+    timed(phases, "write_html", generate_site.write_html, sites, output_file)
+    timed(
+        phases, "write_html_shards", generate_site.write_html, sites, output_file, True
+    )
+
+    # Incremental rebuild with nothing changed: one run to fill the manifest, one to reuse it
+    manifest = generate_site.load_manifest(output_dir / "cache.json")
+    generate_site.read_crawl_data(docs_dir, manifest, workers)
+    generate_site.save_manifest(output_dir / "cache.json", manifest)
+    timed(
+        phases,
+        "incremental_noop",
+        lambda: generate_site.read_crawl_data(
+            docs_dir, generate_site.load_manifest(output_dir / "cache.json"), workers
+        ),
+    )
+
+    output_bytes = {
+        str(path.relative_to(output_dir)): path.stat().st_size
+        for path in sorted(output_dir.rglob("*"))
+        if path.is_file() and path.name != "cache.json"
+    }
+    return {
+        "sites": len(sites),
+        "pages_found": sum(len(site["pages"]) for site in sites.values()),
+        "phases": phases,
+        "output_bytes": output_bytes,
+        "output_total_bytes": sum(output_bytes.values()),
+    }
+
+
+def run_size(pages, args, work_dir):
+    """Synthesize a tree and benchmark it in a fresh process so peak RSS is per size"""
+    docs_dir = work_dir / f"docs-{pages}"
+    if not docs_dir.exists():
+        start = time.perf_counter()
+        synthesize_tree(docs_dir, pages, args.shape, args.depth, args.seed)
+        print(f"  synthesized {pages:,} pages in {time.perf_counter() - start:.1f}s")
+
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--run-one",
+        str(docs_dir),
+        "--workers",
+        str(args.workers),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout)
+    result.update({"pages": pages, "shape": args.shape, "workers": args.workers})
+    return result
+
+
+def print_table(results):
+    phase_names = list(results[0]["phases"])
+    print(f"\n{'phase':<20}" + "".join(f"{r['pages']:>14,}" for r in results))
+    print("-" * (20 + 14 * len(results)))
+    for name in phase_names:
+        print(
+            f"{name:<20}"
+            + "".join(f"{r['phases'][name]['seconds']:>13.3f}s" for r in results)
+        )
+    print(
+        f"{'peak RSS (MiB)':<20}"
+        + "".join(
+            f"{max(p['peak_rss_kb'] for p in r['phases'].values()) / 1024:>14.1f}"
+            for r in results
+        )
+    )
+    print(
+        f"{'output (KiB)':<20}"
+        + "".join(f"{r['output_total_bytes'] / 1024:>14,.0f}" for r in results)
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark generate_site.py against synthetic crawl trees"
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Corpus sizes to benchmark (default: %(default)s)",
+    )
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="mixed")
+    parser.add_argument("--depth", type=int, default=4, help="Maximum URL path depth")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Processes used by read_crawl_data()"
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        help="Keep synthetic trees here and reuse them on later runs",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write results as JSON to this file"
+    )
+    parser.add_argument("--run-one", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.run_one:
+        # Child process: benchmark one tree and report on stdout
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = run_benchmark(args.run_one, output_dir, args.workers)
+        json.dump(result, sys.stdout)
+        return
+
+    print("CAES Chatbot - Documentation Generator Benchmark")
+    print("=" * 60)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = args.work_dir or Path(tmp_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        for pages in args.pages:
+            print(f"\nBenchmarking {pages:,} pages ({args.shape})...")
+            results.append(run_size(pages, args, work_dir))
+
+    print_table(results)
+
+    if args.output:
+        report = {
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n[OK] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
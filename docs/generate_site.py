@@ -6,16 +6,285 @@ and generates an interactive HTML site with collapsible sections
 """
 
 import os
+import sys
 import json
 import csv
+import hashlib
+import gzip
+import shutil
+import base64
+import heapq
+import tempfile
+import argparse
+import re
+import time
+import html
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from inspect import GEN_CREATED, getgeneratorstate
+from itertools import groupby, islice
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from collections import defaultdict
+from stat import S_ISREG
+from types import GeneratorType
+from collections import Counter, defaultdict, deque
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit
 
 # Base path to docs directory
 DOCS_BASE = Path(__file__).parent.parent / "docs"
 OUTPUT_DIR = Path(__file__).parent
+# Manifest of parsed sources used by --incremental
+CACHE_FILE = OUTPUT_DIR / ".generate_site_cache.json"
+# Per-page snapshot of the previous run used by --delta and --whats-new
+SNAPSHOT_FILE = OUTPUT_DIR / ".generate_site_snapshot.json"
+DELTA_REPORT_NAME = "crawl_delta.json"
+# Seconds between polls of the docs tree in --watch mode
+WATCH_INTERVAL = 1.0
+# Pages listed per site and kind of change in the "What's new" section
+WHATS_NEW_LIMIT = 25
+# Directory next to index.html holding per-site fragments written by --shards
+SHARD_DIR_NAME = "sections"
+# Directory next to index.html holding the content-hashed CSS/JS written by --minify
+ASSET_DIR_NAME = "assets"
+# Directory next to index.html holding the per-site full-text index (--fulltext)
+FULLTEXT_DIR_NAME = "fulltext"
+FULLTEXT_MANIFEST_NAME = "index.json"
+# Postings buffered while indexing a site before a sorted run is spilled to a
+# temporary file, which bounds memory however many documents a site has
+FULLTEXT_RUN_POSTINGS = 1 << 20
+# Leading plain text kept per document for result snippets
+FULLTEXT_EXCERPT_CHARS = 300
+# Length of the term prefixes listed per site in the manifest, which tell the
+# page which shards a query needs (FULLTEXT_PREFIX_CHARS in PAGE_SCRIPT)
+FULLTEXT_PREFIX_CHARS = 2
+# {name} slots of a Template and the characters escape_html() has to replace
+TEMPLATE_SLOT = re.compile(r"\{([A-Za-z_]\w*)\}")
+HTML_SPECIAL = re.compile(r"[&<>\"']")
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_MARKUP = re.compile(r"[\s#*_>`|]+")
+# Generated output directories that must not be scanned as crawl sites
+GENERATED_DIRS = [SHARD_DIR_NAME, ASSET_DIR_NAME, FULLTEXT_DIR_NAME]
+# Prebuilt search index written next to index.html
+SEARCH_INDEX_NAME = "search-index.json"
+# --minify: indentation and blank lines in the markup, comments and spacing in
+# the stylesheet (the script only loses indentation and comment lines)
+MARKUP_INDENT = re.compile(rb"\n\s+")
+CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+CSS_SPACE = re.compile(r"\s*([{};,>])\s*|(:)\s+|\s+")
+# Names write_asset() gives the stylesheet and script, and their .gz siblings
+ASSET_FILE = re.compile(r"site\.[0-9a-f]{12}\.(?:css|js)(?:\.gz)?")
+# Markdown fallback: how much of each file is scanned for front matter,
+# and the patterns read_front_matter() extracts in a single pass
+FRONT_MATTER_CHARS = 4096
+# Threads reading markdown files ahead of the parser (--io-workers)
+IO_WORKERS = 8
+FRONT_MATTER_PATTERN = re.compile(
+    r"^(?P<link_key>url|dropbox_url):[ \t]+(?P<link>https?://[^\s]+)"
+    r"|^(?P<key>source|title):[ \t]+(?P<value>.+)$"
+    r"|\*\*Source:\*\*\s+(?P<source_link>https?://[^\s]+)",
+    re.MULTILINE,
+)
+SOURCE_LINK_PATTERN = re.compile(r"\*\*Source:\*\*\s+(https?://[^\s]+)")
+# TeamDynamix category files: ### Article Title followed by **Link:** URL
+ARTICLE_PATTERN = re.compile(r"###\s+(.+?)\n\n\*\*Link:\*\*\s+(https?://[^\s]+)")
+
+# Search terms are runs of letters and digits (must match tokenize() in the page script)
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Directories whose subdirectories are listed as separate sites
+NESTED_SITE_DIRS = ["teamdynamix", "dropbox", "wordpress-uploads-processed"]
+# JSON summaries larger than this are streamed instead of loaded whole; the
+# big arrays listed are kept out of the stored summary in either case
+JSON_STREAM_BYTES = 8 << 20
+STREAMED_ARRAYS = ("files", "processed_files")
+# Hosts treated as the same site when comparing URLs (extended with --host-alias)
+HOST_ALIASES = {"devssl.caes.uga.edu": "secure.caes.uga.edu"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Query parameters that don't change which page a URL points to; dl only
+# switches Dropbox share links between preview and download
+IGNORED_QUERY_PARAMS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_ga", "dl"}
+IGNORED_QUERY_PREFIXES = ("utm_",)
+# When the same page comes from several sources, the richest listing is kept
+SOURCE_PRIORITY = ["csv", "metadata", "file", "direct", "teamdynamix", "dropbox"]
+DUPLICATES_REPORT_NAME = "duplicates.json"
+# Crawl output files scan_site() looks for in each site directory
+SOURCE_FILES = [
+    "crawl_inventory.csv",
+    "_metadata.json",
+    "crawl_summary.json",
+    "api_processing_summary.json",
+]
+
+
+class BuildStats:
+    """Wall time and counters per phase and per site, reported by --profile
+
+    Phase times are exclusive: time spent in a nested phase is not added to
+    the enclosing one. Counters (files_read, bytes_read, regex_calls,
+    pages_emitted, output_bytes, ...) go to the innermost phase and, while a
+    site is being processed, to that site as well.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.sites = {}
+        self._stack = []
+        self._site = None
+
+    @staticmethod
+    def _bucket(table, name):
+        return table.setdefault(name, defaultdict(int))
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            parent, started = self._stack[-1]
+            self._bucket(self.phases, parent)["seconds"] += now - started
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            _, started = self._stack.pop()
+            now = time.perf_counter()
+            self._bucket(self.phases, name)["seconds"] += now - started
+            if self._stack:
+                self._stack[-1][1] = now
+
+    @contextmanager
+    def site(self, name):
+        previous, self._site = self._site, name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._bucket(self.sites, name)["seconds"] += time.perf_counter() - started
+            self._site = previous
+
+    def count(self, key, amount=1):
+        if self._stack:
+            self._bucket(self.phases, self._stack[-1][0])[key] += amount
+        if self._site is not None:
+            self._bucket(self.sites, self._site)[key] += amount
+
+    def count_file(self, f):
+        """Count a file that is read in full"""
+        self.count("files_read")
+        self.count("bytes_read", os.fstat(f.fileno()).st_size)
+
+    def record_site(self, name, **counters):
+        """Add counters to a site without making it the active one"""
+        bucket = self._bucket(self.sites, name)
+        for key, value in counters.items():
+            bucket[key] += value
+
+    def merge(self, phases, sites):
+        """Add counters collected in a worker, dropping its overlapping phase times"""
+        for table, other in ((self.phases, phases), (self.sites, sites)):
+            for name, counters in other.items():
+                bucket = self._bucket(table, name)
+                for key, value in counters.items():
+                    if table is self.sites or key != "seconds":
+                        bucket[key] += value
+
+    def report(self):
+        return {"phases": self.phases, "sites": self.sites}
+
+
+# Collects instrumentation for the current run (see BuildStats)
+STATS = BuildStats()
+
+
+def intern_value(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Page:
+    """A crawled page as listed in the documentation
+
+    Slotted to keep large corpora compact. Only the fields the renderers use
+    are kept, and the low-cardinality ones (source, depth, folder, category)
+    are interned so all pages share a single copy of each value. sort_key is
+    the title's title_sort_key(), computed once here for every sort.
+    """
+
+    __slots__ = (
+        "url",
+        "title",
+        "local_file",
+        "source",
+        "depth",
+        "folder",
+        "category",
+        "duplicate_of",
+        "sort_key",
+    )
+
+    def __init__(
+        self,
+        url="",
+        title="Untitled",
+        local_file="",
+        source="",
+        depth="N/A",
+        folder=None,
+        category=None,
+    ):
+        self.url = url
+        # Crawl metadata can hold null or numeric titles; render them as text
+        self.title = title if isinstance(title, str) else str(title)
+        self.sort_key = title_sort_key(self.title)
+        self.local_file = local_file
+        self.source = intern_value(source)
+        self.depth = intern_value(depth)
+        self.folder = intern_value(folder)
+        self.category = intern_value(category)
+        # Set by dedupe_sites(), never cached since it depends on other sites
+        self.duplicate_of = None
+
+    def as_list(self):
+        """Constructor arguments in __slots__ order, for pickling and the manifest"""
+        return [
+            self.url,
+            self.title,
+            self.local_file,
+            self.source,
+            self.depth,
+            self.folder,
+            self.category,
+        ]
+
+    def __reduce__(self):
+        if self.duplicate_of is None:
+            return Page, tuple(self.as_list())
+        # Flagged pages sent to render workers keep their flag as slot state
+        return Page, tuple(self.as_list()), (None, {"duplicate_of": self.duplicate_of})
+
+    def __repr__(self):
+        return f"Page({self.url!r}, {self.title!r})"
+
+
+def title_sort_key(title):
+    """Case- and accent-insensitive collation key for a title
+
+    Titles that fold to the same text are ordered by the title itself, so
+    the order never depends on input order or the machine's locale.
+    """
+    if title.isascii():
+        folded = title.lower()
+    else:
+        folded = "".join(
+            char
+            for char in unicodedata.normalize("NFKD", title.casefold())
+            if not unicodedata.combining(char)
+        )
+    return f"{folded}\0{title}"
+
+
+page_sort_key = attrgetter("sort_key")
 
 
 def normalize_url(url):
@@ -26,383 +295,1406 @@ def normalize_url(url):
     return url.replace("https://devssl.caes.uga.edu", "https://secure.caes.uga.edu")
 
 
-def read_crawl_data():
-    """Read all crawl inventory and summary files, including subdirectories"""
-    sites = {}
+def canonical_url(url, host_aliases=HOST_ALIASES):
+    """Comparison key for a URL, identical for URLs that point at the same page
+
+    Lowercases the scheme and host, applies host aliases, drops default ports,
+    tracking query parameters, the fragment and trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    host = host_aliases.get(host, host)
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = (
+        host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    )
+    path = parts.path.rstrip("/") or ("/" if netloc else "")
+    query = "&".join(
+        param
+        for param in parts.query.split("&")
+        if param
+        and param.split("=", 1)[0] not in IGNORED_QUERY_PARAMS
+        and not param.startswith(IGNORED_QUERY_PREFIXES)
+    )
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def iter_site_dirs(base_path, parent_name="", listing=None):
+    """Yield a SiteDir for every site directory in scan order
+
+    Each directory is listed exactly once: a site's own listing is also the
+    one its nested sites are found in.
+    """
+    if listing is None:
+        listing = SiteDir(base_path)
+    for name in listing.dir_names:
+        if not parent_name and name in GENERATED_DIRS:
+            continue
 
-    # Recursively find all directories that might contain content
-    def scan_directory(base_path, parent_name=""):
-        """Recursively scan for crawl data and markdown files"""
-        for item in base_path.iterdir():
-            if not item.is_dir():
-                continue
+        site = SiteDir(listing.path / name, parent_name, listing)
+        yield site
+
+        # Recursively scan subdirectories (one level deep for teamdynamix, dropbox...)
+        if not parent_name or name in NESTED_SITE_DIRS:
+            yield from iter_site_dirs(site.path, site.name, site)
+
+
+class SiteDir:
+    """A directory listed once with os.scandir
+
+    File and subdirectory names come from the listing itself, so looking for
+    a crawl file, collecting the markdown files or finding nested sites costs
+    no further syscalls. Sizes and mtimes are fetched on first use and cached.
+    The walk hands the same SiteDir to the manifest check and to scan_site(),
+    in pool workers too, since unlike DirEntry objects it can be pickled.
+    """
+
+    __slots__ = ("path", "parent_name", "parent", "file_names", "dir_names", "stats")
+
+    def __init__(self, path, parent_name="", parent=None):
+        self.path = Path(path)
+        self.parent_name = parent_name
+        # Listing of the containing directory, if the walk has one
+        self.parent = parent
+        # Ordered like the listing; a dict for constant time lookups
+        self.file_names = {}
+        self.dir_names = []
+        self.stats = {}
+        with os.scandir(self.path) as it:
+            for entry in it:
+                # The entry type comes with the listing, only symlinks need a stat
+                if entry.is_dir():
+                    self.dir_names.append(entry.name)
+                elif entry.is_file():
+                    self.file_names[entry.name] = None
+        STATS.count("dirs_listed")
+
+    @property
+    def name(self):
+        return (
+            f"{self.parent_name}/{self.path.name}"
+            if self.parent_name
+            else self.path.name
+        )
+
+    def parent_dir(self):
+        """Listing of the containing directory, listed now if the walk didn't"""
+        if self.parent is None:
+            self.parent = SiteDir(self.path.parent, self.parent_name.rpartition("/")[0])
+        return self.parent
+
+    def has_file(self, name):
+        return name in self.file_names
+
+    def files(self, suffix):
+        """Paths of the files whose name ends with suffix, in listing order"""
+        return [self.path / name for name in self.file_names if name.endswith(suffix)]
+
+    def stat(self, name):
+        """(mtime_ns, size) of a listed file, or None if it is gone"""
+        if name not in self.stats:
+            try:
+                st = os.stat(os.path.join(self.path, name))
+                self.stats[name] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                self.stats[name] = None
+        return self.stats[name]
+
+
+class SourceAdapter:
+    """A crawl output format scan_site() reads pages from
+
+    Detection only looks at directory listings and the site's name: all
+    files must be present, and parent_files in the containing directory, at
+    least one file must end with suffix, and parent and name restrict the
+    adapter to particular nested sites. Fallback adapters are skipped once an
+    earlier one has found pages.
+    """
+
+    __slots__ = (
+        "parse",
+        "files",
+        "parent_files",
+        "suffix",
+        "parent",
+        "name",
+        "fallback",
+    )
+
+    def __init__(
+        self,
+        parse,
+        files=(),
+        parent_files=(),
+        suffix=None,
+        parent=None,
+        name=None,
+        fallback=True,
+    ):
+        self.parse = parse
+        self.files = tuple(files)
+        self.parent_files = tuple(parent_files)
+        self.suffix = suffix
+        self.parent = parent
+        self.name = name
+        self.fallback = fallback
+
+    def detects(self, site):
+        return (
+            (self.parent is None or site.parent_name == self.parent)
+            and (self.name is None or site.path.name == self.name)
+            and all(site.has_file(name) for name in self.files)
+            and all(site.parent_dir().has_file(name) for name in self.parent_files)
+            and (
+                self.suffix is None
+                or any(name.endswith(self.suffix) for name in site.file_names)
+            )
+        )
 
-            site_name = f"{parent_name}/{item.name}" if parent_name else item.name
-            crawl_data = {
-                "name": site_name,
-                "pages": [],
-                "summary": {},
-                "crawl_date": None,
-                "is_subdirectory": bool(parent_name),
-            }
+    def __repr__(self):
+        return f"SourceAdapter({self.parse.__name__})"
 
-            # Read crawl_inventory.csv if it exists
-            csv_file = item / "crawl_inventory.csv"
-            if csv_file.exists():
-                with open(csv_file, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    rows = list(reader)
-                    for row in rows:
-                        # Normalize URLs
-                        if "URL" in row:
-                            row["URL"] = normalize_url(row["URL"])
-                        crawl_data["pages"].append(row)
-
-                    # Extract base URL from first row
-                    if rows and not crawl_data["summary"].get("base_url"):
-                        first_url = normalize_url(rows[0].get("URL", ""))
-                        if first_url:
-                            from urllib.parse import urlparse
-
-                            parsed = urlparse(first_url)
-                            crawl_data["summary"][
-                                "base_url"
-                            ] = f"{parsed.scheme}://{parsed.netloc}"
-
-                    # Extract crawl date from first row
-                    if rows and not crawl_data.get("crawl_date"):
-                        crawl_data["crawl_date"] = rows[0].get("Crawl Date")
-
-            # Read _metadata.json if it exists (has URL mappings)
-            metadata_file = item / "_metadata.json"
-            metadata = {}
-            if metadata_file.exists():
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
-                    # Store base URL in summary (always, regardless of whether pages exist)
-                    base_url = normalize_url(metadata.get("baseUrl"))
-                    # If baseUrl is None, try to extract from first page URL
-                    if not base_url and metadata.get("files"):
-                        first_url = normalize_url(metadata["files"][0].get("url", ""))
-                        if first_url:
-                            from urllib.parse import urlparse
-
-                            parsed = urlparse(first_url)
-                            base_url = f"{parsed.scheme}://{parsed.netloc}"
-                    crawl_data["summary"]["base_url"] = base_url
-                    crawl_data["crawl_date"] = metadata.get("crawledAt")
-
-                    # Build filename to URL mapping
-                    file_url_map = {
-                        file_info["filename"]: file_info
-                        for file_info in metadata.get("files", [])
-                    }
 
-                    # Build pages from metadata if no pages from CSV
-                    if not crawl_data["pages"]:
-                        for file_info in metadata.get("files", []):
-                            crawl_data["pages"].append(
-                                {
-                                    "URL": normalize_url(file_info.get("url", "")),
-                                    "Title": file_info.get("title", "Untitled"),
-                                    "Local File": f"docs/{site_name}/{file_info['filename']}",
-                                    "Source": "metadata",
-                                    "Depth": "0",
-                                }
-                            )
+# Adapters in the order scan_site() tries them
+SOURCE_ADAPTERS = []
 
-            # Read crawl_summary.json if it exists
-            if not crawl_data["pages"]:
-                json_file = item / "crawl_summary.json"
-                if json_file.exists():
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        summary = json.load(f)
-                        crawl_data["summary"] = summary
-                        crawl_data["crawl_date"] = summary.get("crawl_date")
-
-                        # If no CSV, build pages list from summary files
-                        if not crawl_data["pages"] and "files" in summary:
-                            for file_entry in summary.get("files", []):
-                                # Handle both old format (string) and new format (dict)
-                                if isinstance(file_entry, dict):
-                                    # New format with url, filename, filepath, etc.
-                                    url = file_entry.get("url", "")
-                                    title = file_entry.get("title", "Untitled")
-                                    file_path = file_entry.get("filepath", "")
-                                else:
-                                    # Old format (just a string path)
-                                    file_path = file_entry
-                                    file_name = Path(file_path).name
-                                    url = f"{summary.get('base_url', '')}/{file_name.replace('.md', '')}"
-                                    title = (
-                                        file_name.replace(".md", "")
-                                        .replace("-", " ")
-                                        .title()
-                                    )
-
-                                crawl_data["pages"].append(
-                                    {
-                                        "URL": url,
-                                        "Title": title,
-                                        "Local File": file_path,
-                                        "Source": "file",
-                                        "Depth": "0",
-                                    }
-                                )
-
-            # Special handling for dropbox/intranet-files - check for api_processing_summary.json
-            if (
-                parent_name == "dropbox"
-                and item.name == "intranet-files"
-                and not crawl_data["pages"]
-            ):
-                api_summary_file = item / "api_processing_summary.json"
-                if api_summary_file.exists():
-                    with open(api_summary_file, "r", encoding="utf-8") as f:
-                        api_summary = json.load(f)
-                        crawl_data["crawl_date"] = api_summary.get("processed_at")
-                        crawl_data["summary"] = (
-                            api_summary  # Store full summary for folder grouping
-                        )
-                        # Build pages from processed_files list, excluding Destiny One Payout files
-                        for file_info in api_summary.get("processed_files", []):
-                            title = file_info.get("title", "Untitled")
-                            # Skip Destiny One Payout files
-                            if "Destiny One Payout" in title:
-                                continue
-                            crawl_data["pages"].append(
-                                {
-                                    "URL": file_info.get("share_url", ""),
-                                    "Title": title,
-                                    "Local File": file_info.get("output_path", ""),
-                                    "Source": "dropbox",
-                                    "Folder": file_info.get(
-                                        "folder", "uncategorized"
-                                    ),  # Add folder info
-                                    "Depth": "0",
-                                }
-                            )
 
-            # Special handling for TeamDynamix subdirectories - check parent's crawl_summary.json
-            if parent_name == "teamdynamix" and not crawl_data["pages"]:
-                parent_summary_file = item.parent / "crawl_summary.json"
-                if parent_summary_file.exists():
-                    with open(parent_summary_file, "r", encoding="utf-8") as f:
-                        parent_summary = json.load(f)
-
-                        # New structure with groups
-                        if (
-                            parent_summary.get("structure") == "folders"
-                            and "groups" in parent_summary
-                        ):
-                            # Find this folder in the groups
-                            group_data = parent_summary["groups"].get(item.name)
-                            if group_data:
-                                crawl_data["crawl_date"] = parent_summary.get("crawled")
-                                crawl_data["summary"][
-                                    "base_url"
-                                ] = "https://uga.teamdynamix.com"
-
-                                # Process each category in this group
-                                for category_key, category_info in group_data.get(
-                                    "categories", {}
-                                ).items():
-                                    # Read the markdown file for this category
-                                    category_file = (
-                                        item / Path(category_info["file"]).name
-                                    )
-                                    if category_file.exists():
-                                        try:
-                                            content = category_file.read_text(
-                                                encoding="utf-8"
-                                            )
-                                            import re
-
-                                            # Extract all article links from the markdown content
-                                            article_pattern = r"###\s+(.+?)\n\n\*\*Link:\*\*\s+(https?://[^\s]+)"
-                                            articles = re.findall(
-                                                article_pattern, content
-                                            )
-
-                                            # Add each article as a separate page
-                                            for article_title, article_url in articles:
-                                                crawl_data["pages"].append(
-                                                    {
-                                                        "URL": article_url.strip(),
-                                                        "Title": article_title.strip(),
-                                                        "Local File": str(
-                                                            category_file
-                                                        ),
-                                                        "Source": "teamdynamix",
-                                                        "Category": category_info.get(
-                                                            "name", ""
-                                                        ),
-                                                        "Depth": "0",
-                                                    }
-                                                )
-                                        except Exception as e:
-                                            pass
-
-                        # Old structure - check if this subdirectory is in the categories
-                        elif (
-                            "categories" in parent_summary
-                            and item.name in parent_summary["categories"]
-                        ):
-                            category_data = parent_summary["categories"][item.name]
-                            crawl_data["crawl_date"] = parent_summary.get("crawl_date")
-                            # Build pages from articles list
-                            for article in category_data.get("articles", []):
-                                crawl_data["pages"].append(
-                                    {
-                                        "URL": article.get("url", ""),
-                                        "Title": article.get("title", "Untitled"),
-                                        "Local File": f"docs/teamdynamix/{item.name}",
-                                        "Source": "teamdynamix",
-                                        "Depth": "0",
-                                    }
-                                )
-
-            # If no crawl files found, scan for markdown files directly
-            # (Check if summary is empty or only has base_url from metadata)
-            if not crawl_data["pages"]:
-                md_files = list(item.glob("*.md"))
-                if md_files:
-                    for md_file in md_files:
-                        # Try to extract URL from markdown metadata
-                        url = f"file:///{md_file}"
-                        title = md_file.stem.replace("-", " ").replace("_", " ").title()
-
-                        try:
-                            content = md_file.read_text(encoding="utf-8")
-                            import re
-
-                            # Check if this is a TeamDynamix category file
-                            is_teamdynamix = re.search(
-                                r"^source:\s+TeamDynamix Knowledge Base",
-                                content,
-                                re.MULTILINE,
-                            )
+def source_adapter(**detection):
+    """Register a parse(site, crawl_data) function as a SourceAdapter"""
+
+    def register(parse):
+        SOURCE_ADAPTERS.append(SourceAdapter(parse, **detection))
+        return parse
+
+    return register
 
-                            if is_teamdynamix:
-                                # Extract category info from frontmatter
-                                category_title_match = re.search(
-                                    r"^title:\s+(.+)$", content, re.MULTILINE
-                                )
-                                category_title = (
-                                    category_title_match.group(1).strip()
-                                    if category_title_match
-                                    else title
-                                )
-
-                                # Extract all article links from the markdown content
-                                # Pattern: ### Article Title followed by **Link:** URL
-                                article_pattern = (
-                                    r"###\s+(.+?)\n\n\*\*Link:\*\*\s+(https?://[^\s]+)"
-                                )
-                                articles = re.findall(article_pattern, content)
-
-                                # Add each article as a separate page
-                                for article_title, article_url in articles:
-                                    crawl_data["pages"].append(
-                                        {
-                                            "URL": normalize_url(article_url.strip()),
-                                            "Title": article_title.strip(),
-                                            "Local File": str(md_file),
-                                            "Source": "teamdynamix",
-                                            "Category": category_title,
-                                            "Depth": "0",
-                                        }
-                                    )
-
-                                # Skip adding the category file itself if we found articles
-                                if articles:
-                                    continue
-
-                            # Try frontmatter first (YAML-style: url: https://...)
-                            frontmatter_match = re.search(
-                                r"^url:\s+(https?://[^\s]+)", content, re.MULTILINE
-                            )
-                            if frontmatter_match:
-                                url = frontmatter_match.group(1)
-                                # Also try to get title from frontmatter
-                                title_match = re.search(
-                                    r"^title:\s+(.+)$", content, re.MULTILINE
-                                )
-                                if title_match:
-                                    title = title_match.group(1).strip()
-                            else:
-                                # Try dropbox_url (for ETS files)
-                                dropbox_match = re.search(
-                                    r"^dropbox_url:\s+(https?://[^\s]+)",
-                                    content,
-                                    re.MULTILINE,
-                                )
-                                if dropbox_match:
-                                    url = dropbox_match.group(1)
-                                    # Get title from frontmatter
-                                    title_match = re.search(
-                                        r"^title:\s+(.+)$", content, re.MULTILINE
-                                    )
-                                    if title_match:
-                                        title = title_match.group(1).strip()
-                                else:
-                                    # Fall back to **Source:** pattern (Dropbox GA Counts style)
-                                    source_match = re.search(
-                                        r"\*\*Source:\*\*\s+(https?://[^\s]+)", content
-                                    )
-                                    if source_match:
-                                        url = source_match.group(1)
-                        except:
-                            pass
 
+def scan_site(item):
+    """Parse crawl data and markdown files for a single site directory
+
+    item is a SiteDir from the walk, or the path of a top-level site
+    directory to list here.
+    """
+    site = item if isinstance(item, SiteDir) else SiteDir(item)
+    crawl_data = {
+        "name": site.name,
+        "pages": [],
+        "summary": {},
+        "crawl_date": None,
+        "is_subdirectory": bool(site.parent_name),
+    }
+    for adapter in SOURCE_ADAPTERS:
+        if adapter.fallback and crawl_data["pages"]:
+            continue
+        if adapter.detects(site):
+            adapter.parse(site, crawl_data)
+    return crawl_data
+
+
+@source_adapter(files=["crawl_inventory.csv"], fallback=False)
+def parse_crawl_inventory(site, crawl_data):
+    """crawl_inventory.csv: one page per row"""
+    csv_file = site.path / "crawl_inventory.csv"
+    with open(csv_file, "r", encoding="utf-8") as f:
+        STATS.count_file(f)
+        # Stream the rows, keeping only the columns the renderer uses
+        reader = csv.reader(f)
+        header = next(reader, [])
+        url_col, title_col, file_col, depth_col, date_col = (
+            header.index(name) if name in header else None
+            for name in ("URL", "Title", "Local File", "Depth", "Crawl Date")
+        )
+        first_row = True
+        for row in reader:
+            # Skip blank lines like csv.DictReader does
+            if not row:
+                continue
+            page = Page(
+                url=normalize_url(csv_cell(row, url_col, "")),
+                title=csv_cell(row, title_col, "Untitled"),
+                local_file=csv_cell(row, file_col, ""),
+                source="csv",
+                depth=csv_cell(row, depth_col, "N/A"),
+            )
+            crawl_data["pages"].append(page)
+
+            if first_row:
+                first_row = False
+                # Extract base URL from first row
+                if page.url and not crawl_data["summary"].get("base_url"):
+                    parsed = urlparse(page.url)
+                    crawl_data["summary"][
+                        "base_url"
+                    ] = f"{parsed.scheme}://{parsed.netloc}"
+
+                # Extract crawl date from first row
+                if not crawl_data.get("crawl_date"):
+                    crawl_data["crawl_date"] = csv_cell(row, date_col, None)
+
+
+@source_adapter(files=["_metadata.json"], fallback=False)
+def parse_metadata(site, crawl_data):
+    """_metadata.json: base URL and crawl date, and the pages if there is no CSV"""
+    metadata_file = site.path / "_metadata.json"
+    metadata, files = read_json_summary(metadata_file)
+    base_url = normalize_url(metadata.get("baseUrl"))
+    # Build pages from metadata if no pages from CSV
+    build_pages = not crawl_data["pages"]
+    # A single pass over the files, which may be streamed from disk
+    if build_pages or not base_url:
+        for file_no, file_info in enumerate(files("files")):
+            # If baseUrl is None, try to extract from first page URL
+            if file_no == 0 and not base_url:
+                first_url = normalize_url(file_info.get("url", ""))
+                if first_url:
+                    parsed = urlparse(first_url)
+                    base_url = f"{parsed.scheme}://{parsed.netloc}"
+            if not build_pages:
+                break
+            crawl_data["pages"].append(
+                Page(
+                    url=normalize_url(file_info.get("url", "")),
+                    title=file_info.get("title", "Untitled"),
+                    local_file=f"docs/{site.name}/{file_info['filename']}",
+                    source="metadata",
+                    depth="0",
+                )
+            )
+    # Store base URL in summary (always, regardless of whether pages exist)
+    crawl_data["summary"]["base_url"] = base_url
+    crawl_data["crawl_date"] = metadata.get("crawledAt")
+
+
+@source_adapter(files=["crawl_summary.json"])
+def parse_crawl_summary(site, crawl_data):
+    """crawl_summary.json listing files in the old (path) or new (dict) format"""
+    json_file = site.path / "crawl_summary.json"
+    summary, files = read_json_summary(json_file)
+    crawl_data["summary"] = summary
+    crawl_data["crawl_date"] = summary.get("crawl_date")
+
+    # If no CSV, build pages list from summary files
+    if not crawl_data["pages"]:
+        for file_entry in files("files"):
+            # Handle both old format (string) and new format (dict)
+            if isinstance(file_entry, dict):
+                # New format with url, filename, filepath, etc.
+                url = file_entry.get("url", "")
+                title = file_entry.get("title", "Untitled")
+                file_path = file_entry.get("filepath", "")
+            else:
+                # Old format (just a string path)
+                file_path = file_entry
+                file_name = Path(file_path).name
+                url = f"{summary.get('base_url', '')}/{file_name.replace('.md', '')}"
+                title = file_name.replace(".md", "").replace("-", " ").title()
+
+            crawl_data["pages"].append(
+                Page(
+                    url=url,
+                    title=title,
+                    local_file=file_path,
+                    source="file",
+                    depth="0",
+                )
+            )
+
+
+@source_adapter(
+    files=["api_processing_summary.json"], parent="dropbox", name="intranet-files"
+)
+def parse_dropbox_intranet(site, crawl_data):
+    """dropbox/intranet-files: api_processing_summary.json with a folder per file"""
+    api_summary_file = site.path / "api_processing_summary.json"
+    api_summary, processed_files = read_json_summary(api_summary_file)
+    crawl_data["crawl_date"] = api_summary.get("processed_at")
+    # Folders come from each page, so only the header is kept
+    crawl_data["summary"] = api_summary
+    # Build pages from processed_files list, excluding Destiny One Payout files
+    for file_info in processed_files("processed_files"):
+        title = file_info.get("title", "Untitled")
+        # Skip Destiny One Payout files
+        if "Destiny One Payout" in title:
+            continue
+        crawl_data["pages"].append(
+            Page(
+                url=file_info.get("share_url", ""),
+                title=title,
+                local_file=file_info.get("output_path", ""),
+                source="dropbox",
+                folder=file_info.get("folder", "uncategorized"),  # Add folder info
+                depth="0",
+            )
+        )
+
+
+@source_adapter(parent="teamdynamix", parent_files=["crawl_summary.json"])
+def parse_teamdynamix_group(site, crawl_data):
+    """TeamDynamix group directories, described by the parent's crawl_summary.json"""
+    parent_summary_file = site.path.parent / "crawl_summary.json"
+    # Parsed once per run and shared by all the group directories
+    parent_summary, _ = read_json_summary(parent_summary_file)
+
+    # New structure with groups
+    if parent_summary.get("structure") == "folders" and "groups" in parent_summary:
+        # Find this folder in the groups
+        group_data = parent_summary["groups"].get(site.path.name)
+        if group_data:
+            crawl_data["crawl_date"] = parent_summary.get("crawled")
+            crawl_data["summary"]["base_url"] = "https://uga.teamdynamix.com"
+
+            # Read the category markdown files ahead of parsing them, in order
+            categories = []
+            for category_info in group_data.get("categories", {}).values():
+                category_name = Path(category_info["file"]).name
+                if site.has_file(category_name):
+                    categories.append((category_info, site.path / category_name))
+            contents = prefetch(read_text, [path for _, path in categories])
+
+            # Process each category in this group
+            for (category_info, category_file), fetch in zip(categories, contents):
+                try:
+                    content = fetch()
+                    STATS.count("files_read")
+                    STATS.count("bytes_read", len(content))
+
+                    # Extract all article links from the markdown content
+                    articles = ARTICLE_PATTERN.findall(content)
+                    STATS.count("regex_calls")
+
+                    # Add each article as a separate page
+                    for article_title, article_url in articles:
                         crawl_data["pages"].append(
-                            {
-                                "URL": normalize_url(url),
-                                "Title": title,
-                                "Local File": str(md_file),
-                                "Source": "direct",
-                                "Depth": "0",
-                            }
+                            Page(
+                                url=article_url.strip(),
+                                title=article_title.strip(),
+                                local_file=str(category_file),
+                                source="teamdynamix",
+                                category=category_info.get("name", ""),
+                                depth="0",
+                            )
                         )
+                except Exception as e:
+                    pass
+
+    # Old structure - check if this subdirectory is in the categories
+    elif (
+        "categories" in parent_summary
+        and site.path.name in parent_summary["categories"]
+    ):
+        category_data = parent_summary["categories"][site.path.name]
+        crawl_data["crawl_date"] = parent_summary.get("crawl_date")
+        # Build pages from articles list
+        for article in category_data.get("articles", []):
+            crawl_data["pages"].append(
+                Page(
+                    url=article.get("url", ""),
+                    title=article.get("title", "Untitled"),
+                    local_file=f"docs/teamdynamix/{site.path.name}",
+                    source="teamdynamix",
+                    depth="0",
+                )
+            )
 
-            # Add if has content
-            if crawl_data["pages"] or crawl_data["summary"]:
-                sites[site_name] = crawl_data
 
-            # Recursively scan subdirectories (one level deep for teamdynamix, dropbox, etc.)
-            if not parent_name or item.name in [
-                "teamdynamix",
-                "dropbox",
-                "wordpress-uploads-processed",
-            ]:
-                scan_directory(item, site_name)
+@source_adapter(suffix=".md")
+def parse_markdown(site, crawl_data):
+    """Plain markdown files, with the URL taken from front matter or a Source link"""
+    md_files = site.files(".md")
+    for md_file, fetch in zip(md_files, prefetch(load_markdown, md_files)):
+        # Try to extract URL from markdown metadata
+        url = f"file:///{md_file}"
+        title = md_file.stem.replace("-", " ").replace("_", " ").title()
+
+        try:
+            fields, truncated, chars_read, content = fetch()
+            STATS.count("files_read")
+            STATS.count("bytes_read", chars_read)
+            STATS.count("regex_calls")
+
+            # Check if this is a TeamDynamix category file
+            if fields.get("source", "").startswith("TeamDynamix Knowledge Base"):
+                # Extract category info from frontmatter
+                category_title = fields.get("title", title)
+
+                # Only category files need the whole body for their article links
+                articles = ARTICLE_PATTERN.findall(content)
+                STATS.count("bytes_read", len(content))
+                STATS.count("regex_calls")
+
+                # Add each article as a separate page
+                for article_title, article_url in articles:
+                    crawl_data["pages"].append(
+                        Page(
+                            url=normalize_url(article_url.strip()),
+                            title=article_title.strip(),
+                            local_file=str(md_file),
+                            source="teamdynamix",
+                            category=category_title,
+                            depth="0",
+                        )
+                    )
+
+                # Skip adding the category file itself if we found articles
+                if articles:
+                    continue
+
+            # Try frontmatter first (YAML-style: url: https://...),
+            # then dropbox_url (for ETS files)
+            frontmatter_url = fields.get("url") or fields.get("dropbox_url")
+            if frontmatter_url:
+                url = frontmatter_url
+                # Also try to get title from frontmatter
+                title = fields.get("title", title)
+            else:
+                # Fall back to **Source:** pattern (Dropbox GA Counts style)
+                source_url = fields.get("**Source:**")
+                if not source_url and truncated:
+                    source_match = SOURCE_LINK_PATTERN.search(content)
+                    STATS.count("bytes_read", len(content))
+                    STATS.count("regex_calls")
+                    source_url = source_match.group(1) if source_match else None
+                if source_url:
+                    url = source_url
+        except:
+            pass
+
+        crawl_data["pages"].append(
+            Page(
+                url=normalize_url(url),
+                title=title,
+                local_file=str(md_file),
+                source="direct",
+                depth="0",
+            )
+        )
+
+
+def csv_cell(row, column, default):
+    """Value of a CSV column by position, or default if the row doesn't have it"""
+    return row[column] if column is not None and column < len(row) else default
+
+
+def prefetch(read, paths, io_workers=None):
+    """Call read(path) for each path on a thread pool, a bounded window ahead
+
+    Returns an iterator of zero-argument fetch functions in the same order as
+    paths; calling one waits for that read and returns its result, or raises
+    what read raised, so callers handle errors exactly where they used to
+    read the file themselves. At most 2 * io_workers reads are in flight,
+    and with io_workers <= 1 each read simply runs when fetched.
+    """
+    io_workers = IO_WORKERS if io_workers is None else io_workers
+    if io_workers <= 1 or len(paths) < 2:
+        return (partial(read, path) for path in paths)
+    return _prefetch(read, paths, io_workers)
+
+
+def _prefetch(read, paths, io_workers):
+    executor = ThreadPoolExecutor(max_workers=min(io_workers, len(paths)))
+    yield from run_ahead(
+        executor, (partial(read, path) for path in paths), 2 * io_workers
+    )
+
+
+def run_ahead(executor, calls, window_size):
+    """Submit zero-argument calls to executor, yielding their result getters in order
+
+    At most window_size calls are in flight ahead of the consumer. The
+    executor is shut down once the generator finishes or is closed.
+    """
+    try:
+        pending = iter(calls)
+        window = deque(executor.submit(call) for call in islice(pending, window_size))
+        while window:
+            future = window.popleft()
+            for call in islice(pending, 1):
+                window.append(executor.submit(call))
+            yield future.result
+    finally:
+        # A consumer that stops early leaves queued calls to be cancelled
+        executor.shutdown(cancel_futures=True)
+
+
+def read_text(path):
+    return path.read_text(encoding="utf-8")
+
+
+def read_front_matter(md_file):
+    """Parse the known metadata keys from the start of a markdown file
+
+    Only the first FRONT_MATTER_CHARS characters are read and scanned once for
+    source/title/url/dropbox_url lines and a **Source:** link. Returns
+    (fields, truncated, chars_read), where fields maps each key to its first
+    value and truncated tells whether the file continues past the block that
+    was read. This runs on prefetch() threads, so the caller counts STATS.
+    """
+    with open(md_file, "r", encoding="utf-8") as f:
+        header = f.read(FRONT_MATTER_CHARS)
+        truncated = bool(f.read(1))
+    chars_read = len(header)
+    if truncated:
+        # Drop the partial last line so no value is cut short
+        header = header[: header.rfind("\n") + 1]
+
+    fields = {}
+    for match in FRONT_MATTER_PATTERN.finditer(header):
+        if match.group("link_key"):
+            fields.setdefault(match.group("link_key"), match.group("link"))
+        elif match.group("key"):
+            fields.setdefault(match.group("key"), match.group("value").strip())
+        else:
+            fields.setdefault("**Source:**", match.group("source_link"))
+    return fields, truncated, chars_read
+
+
+def load_markdown(md_file):
+    """Read stage of parse_markdown(): the front matter, and the text if needed
+
+    TeamDynamix category files need their article links, and long files
+    without a front matter link are searched for a **Source:** line.
+    Returns (fields, truncated, chars_read, content), content being None
+    when the front matter is enough.
+    """
+    fields, truncated, chars_read = read_front_matter(md_file)
+    content = None
+    if fields.get("source", "").startswith("TeamDynamix Knowledge Base") or (
+        truncated
+        and not (
+            fields.get("url") or fields.get("dropbox_url") or fields.get("**Source:**")
+        )
+    ):
+        content = read_text(md_file)
+    return fields, truncated, chars_read, content
+
+
+JSON_WHITESPACE = re.compile(r"[ \t\r\n]*")
+# What skipping an unread array has to look at: brackets and string bodies
+JSON_SKIP = re.compile(r'["\[\]{}]')
+JSON_STRING_REST = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class JsonObjectReader:
+    """Incremental reader for a top-level JSON object too large to load at once
+
+    Text is read in chunk_size blocks and values are decoded one at a time
+    with JSONDecoder.raw_decode, so only the current value and the unread
+    rest of the current block are held in memory.
+    """
+
+    def __init__(self, f, chunk_size=1 << 20):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Append the next block, dropping what was consumed; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """Next non-whitespace character ("" at end of file), left unconsumed"""
+        while True:
+            buf, pos = self.buf, self.pos
+            if pos < len(buf) and buf[pos] not in " \t\r\n":
+                return buf[pos]
+            self.pos = pos = JSON_WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars):
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON, got {char!r}")
+        self.pos += 1
+        return char
+
+    def _value(self):
+        """Decode the next complete value, reading more blocks as needed"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number is only complete once something follows it, it may go on
+            # in the next block
+            if (
+                end == len(self.buf) or self.buf[end] not in " \t\r\n,:]}"
+            ) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _skip_rest(self):
+        """Pass over the rest of an array or object without decoding it"""
+        depth = 1
+        while True:
+            match = JSON_SKIP.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+            elif match.group() == '"':
+                end = JSON_STRING_REST.match(self.buf, match.end())
+                if end is not None:
+                    self.pos = end.end()
+                    continue
+                # The string goes on in the next block
+                self.pos = match.start()
+            else:
+                self.pos = match.end()
+                depth += 1 if match.group() in "[{" else -1
+                if depth == 0:
+                    return
+                continue
+            if not self._fill():
+                raise ValueError("Unterminated array or string in JSON")
+
+    def _elements(self):
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def items(self, streamed=()):
+        """Yield the (key, value) pairs of the top-level object
+
+        Arrays under a key in streamed are yielded as an iterator over their
+        elements instead; whatever the caller leaves unread is skipped before
+        the next pair, without being decoded if it wasn't started.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key in streamed and self._peek() == "[":
+                self.pos += 1
+                elements = self._elements()
+                yield key, elements
+                if getgeneratorstate(elements) == GEN_CREATED:
+                    self._skip_rest()
+                else:
+                    for _ in elements:
+                        pass
+            else:
+                yield key, self._value()
+            if self._expect(",}") == "}":
+                return
+
+
+def read_json_summary(path):
+    """Load a crawl summary JSON file as (header, items)
+
+    header holds the top-level keys except the STREAMED_ARRAYS, which are
+    replaced by their "<key>_count", and items(key) iterates one of those
+    arrays. Each file is parsed at most once per run (cached by path, mtime
+    and size); files over JSON_STREAM_BYTES are never loaded whole, items()
+    re-reads them from disk one element at a time instead, and their counts
+    are only known once items(key) has been read to the end.
+    """
+    st = os.stat(path)
+    header, items = load_json_summary(str(path), st.st_mtime_ns, st.st_size)
+    # Callers add keys to the summary they keep, so hand out a copy
+    return dict(header), items
+
+
+@lru_cache(maxsize=16)
+def load_json_summary(path, mtime_ns, size):
+    """Cached worker of read_json_summary()"""
+    STATS.count("files_read")
+    STATS.count("bytes_read", size)
+    header = {}
+
+    if size <= JSON_STREAM_BYTES:
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        arrays = {}
+        for key, value in document.items():
+            if key in STREAMED_ARRAYS and isinstance(value, list):
+                arrays[key] = value
+                header[f"{key}_count"] = len(value)
+            else:
+                header[key] = value
+        return header, lambda key: iter(arrays.get(key, ()))
+
+    STATS.count("json_streamed")
+    # The arrays are passed over here and only decoded by items()
+    arrays = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for key, value in JsonObjectReader(f).items(STREAMED_ARRAYS):
+            if isinstance(value, GeneratorType):
+                arrays.add(key)
+            else:
+                header[key] = value
+
+    def items(key):
+        if key not in arrays:
+            return
+        STATS.count("bytes_read", size)
+        with open(path, "r", encoding="utf-8") as f:
+            for name, value in JsonObjectReader(f).items((key,)):
+                if name == key:
+                    count = 0
+                    for count, element in enumerate(value, 1):
+                        yield element
+                    header[f"{key}_count"] = count
+                    return
+
+    return header, items
+
+
+def profile_scan_site(site, io_workers=IO_WORKERS):
+    """Run scan_site() under a fresh BuildStats, returning (crawl_data, phases, sites)
+
+    Every parse goes through here, in-process or in a pool worker, so the
+    counters can be merged back into the parent's STATS either way. The
+    io_workers setting is installed the same way, for prefetch() to pick up.
+    """
+    global STATS, IO_WORKERS
+    parent_stats, STATS = STATS, BuildStats()
+    parent_io_workers, IO_WORKERS = IO_WORKERS, io_workers
+    try:
+        with STATS.phase("parse_sites"), STATS.site(site.name):
+            crawl_data = scan_site(site)
+            STATS.count("pages_emitted", len(crawl_data["pages"]))
+        return crawl_data, STATS.phases, STATS.sites
+    finally:
+        STATS = parent_stats
+        IO_WORKERS = parent_io_workers
+
+
+def parse_sites(site_dirs, workers=1, io_workers=IO_WORKERS):
+    """Run scan_site() over SiteDir listings from the walk
+
+    With more than one worker the directories are parsed in a process pool.
+    Within each directory, io_workers threads read markdown files ahead of
+    the parser. Results are always returned in the same order as site_dirs.
+    """
+    scan = partial(profile_scan_site, io_workers=io_workers)
+    if workers <= 1 or len(site_dirs) < 2:
+        results = map(scan, site_dirs)
+        return [merge_site_stats(*result) for result in results]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(site_dirs))) as executor:
+        results = executor.map(scan, site_dirs)
+        return [merge_site_stats(*result) for result in results]
+
+
+def merge_site_stats(crawl_data, phases, sites):
+    STATS.merge(phases, sites)
+    return crawl_data
+
+
+def read_crawl_data(
+    docs_base=DOCS_BASE, manifest=None, workers=1, io_workers=IO_WORKERS
+):
+    """Read all crawl inventory and summary files, including subdirectories
+
+    If a manifest from a previous run is passed, sites whose source files are
+    unchanged reuse the cached crawl data instead of being re-parsed. The
+    manifest is updated in place so the caller can save it for the next run.
+    Site directories that do need parsing are spread over `workers` processes,
+    each reading files with `io_workers` threads.
+    """
+    with STATS.phase("walk_dirs"):
+        site_dirs = list(iter_site_dirs(docs_base))
+    cached_sites = manifest["sites"] if manifest is not None else {}
+    sources = {}
+    results = {}
+
+    # Reuse cached sites first, then parse the rest (possibly in parallel)
+    pending = []
+    with STATS.phase("check_cache"):
+        for site in site_dirs:
+            if manifest is not None:
+                sources[site.name] = fingerprint_sources(site)
+                crawl_data = reuse_cached_site(
+                    cached_sites.get(site.name), sources[site.name]
+                )
+                if crawl_data is not None:
+                    STATS.count("sites_cached")
+                    results[site.name] = crawl_data
+                    continue
+            pending.append(site)
+
+    with STATS.phase("parse_sites"):
+        parsed = parse_sites(pending, workers, io_workers)
+    for site, crawl_data in zip(pending, parsed):
+        results[site.name] = crawl_data
+
+    # Merge in directory scan order
+    sites = {}
+    for site in site_dirs:
+        site_name = site.name
+        crawl_data = results[site_name]
+        # Add if has content
+        if crawl_data["pages"] or crawl_data["summary"]:
+            sites[site_name] = crawl_data
+
+    if manifest is not None:
+        manifest["removed"] = sorted(set(cached_sites) - set(results))
+        manifest["reparsed"] = [site.name for site in pending]
+        manifest["sites"] = {
+            site.name: {"sources": sources[site.name], "data": results[site.name]}
+            for site in site_dirs
+        }
 
-    scan_directory(DOCS_BASE)
     return sites
 
 
+def generator_fingerprint():
+    """Hash of this script, so cached parse results are dropped when it changes"""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+def hash_file(path):
+    """Content hash of a source file"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint_sources(site):
+    """Collect [mtime_ns, size, content_hash] for every file scan_site() may read
+
+    Only files present in the walk's listings are stat'ed, once each. Content
+    hashes are filled in lazily by reuse_cached_site(), only for files whose
+    mtime or size changed since the last run.
+    """
+    candidates = [(site, name) for name in SOURCE_FILES if site.has_file(name)]
+    candidates.extend((site, name) for name in site.file_names if name.endswith(".md"))
+    # TeamDynamix subdirectories are described by the parent's crawl_summary.json
+    if site.parent_name == "teamdynamix":
+        parent = site.parent_dir()
+        if parent.has_file("crawl_summary.json"):
+            candidates.append((parent, "crawl_summary.json"))
+
+    sources = {}
+    for listing, name in candidates:
+        stat = listing.stat(name)
+        if stat is not None:
+            sources[os.path.join(listing.path, name)] = [*stat, None]
+    return sources
+
+
+def reuse_cached_site(entry, sources):
+    """Return cached crawl data if none of the site's sources changed, else None"""
+    if not entry or entry["sources"].keys() != sources.keys():
+        return None
+
+    unchanged = True
+    for path, current in sources.items():
+        mtime_ns, size, content_hash = entry["sources"][path]
+        if current[:2] == [mtime_ns, size]:
+            current[2] = content_hash
+            continue
+        # Touched but possibly identical - compare content before re-parsing
+        current[2] = hash_file(path)
+        if content_hash is None or current[2] != content_hash:
+            unchanged = False
+
+    return entry["data"] if unchanged else None
+
+
+def load_manifest(cache_file):
+    """Load the incremental build manifest, discarding it if stale or unreadable"""
+    manifest = {"generator": generator_fingerprint(), "sites": {}}
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return manifest
+
+    if cached.get("generator") == manifest["generator"]:
+        manifest["sites"] = cached.get("sites", {})
+        manifest["output"] = cached.get("output")
+        manifest["page"] = cached.get("page")
+        for entry in manifest["sites"].values():
+            entry["data"]["pages"] = [
+                Page(*fields) for fields in entry["data"]["pages"]
+            ]
+    return manifest
+
+
+def file_stamp(path):
+    """[mtime_ns, size] of a file, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def save_manifest(cache_file, manifest):
+    """Atomically write the incremental build manifest"""
+    tmp_file = Path(f"{cache_file}.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"), default=Page.as_list)
+    os.replace(tmp_file, cache_file)
+
+
+def find_duplicates(sites, host_aliases=HOST_ALIASES):
+    """Group pages listed more than once across all sites by canonical URL
+
+    Returns {canonical url: [(site_name, page), ...]} for every URL seen more
+    than once, with the copy to keep first: the one from the highest priority
+    source, then the first one in site order.
+    """
+    priority = {source: rank for rank, source in enumerate(SOURCE_PRIORITY)}
+    first_seen = {}
+    duplicates = {}
+    keys = {}
+
+    for site_name, site_data in sites.items():
+        for page in site_data["pages"]:
+            url = page.url
+            if not url or url == "#":
+                continue
+            key = keys.get(url)
+            if key is None:
+                key = keys[url] = canonical_url(url, host_aliases)
+            seen = first_seen.get(key)
+            if seen is None:
+                first_seen[key] = (site_name, page)
+                continue
+            group = duplicates.get(key)
+            if group is None:
+                group = duplicates[key] = [seen]
+            group.append((site_name, page))
+
+    for group in duplicates.values():
+        # Stable, so ties keep site order
+        group.sort(key=lambda entry: priority.get(entry[1].source, len(priority)))
+    STATS.count("duplicate_urls", len(duplicates))
+    return duplicates
+
+
+def dedupe_sites(sites, mode, host_aliases=HOST_ALIASES):
+    """Flag or collapse pages listed under more than one URL spelling or site
+
+    "flag" swaps each extra copy for a flag_duplicate() copy, "collapse" drops
+    it and any site left empty; sites is not modified in place. Returns the
+    sites to render and find_duplicates() groups.
+    """
+    duplicates = find_duplicates(sites, host_aliases)
+    extra = {}
+    for group in duplicates.values():
+        kept_site = group[0][0]
+        for _, page in group[1:]:
+            extra[id(page)] = kept_site
+
+    if mode == "flag":
+        flagged = {}
+        for site_name, site_data in sites.items():
+            pages = [
+                page if id(page) not in extra else flag_duplicate(page, extra[id(page)])
+                for page in site_data["pages"]
+            ]
+            if any(page.duplicate_of is not None for page in pages):
+                site_data = dict(site_data, pages=pages)
+            flagged[site_name] = site_data
+        return flagged, duplicates
+
+    deduped = {}
+    for site_name, site_data in sites.items():
+        pages = [page for page in site_data["pages"] if id(page) not in extra]
+        if len(pages) != len(site_data["pages"]):
+            site_data = dict(site_data, pages=pages)
+        if pages or site_data["summary"]:
+            deduped[site_name] = site_data
+    STATS.count("pages_collapsed", len(extra))
+    return deduped, duplicates
+
+
+def flag_duplicate(page, kept_site):
+    """Copy of a page flagged as a duplicate of the one kept in kept_site"""
+    copy = Page(*page.as_list())
+    copy.duplicate_of = kept_site
+    return copy
+
+
+def write_duplicates_report(report_file, duplicates, mode):
+    """Save the duplicate groups for the chatbot ingestion pipeline"""
+    groups = []
+    for key, group in sorted(duplicates.items()):
+        copies = [
+            {
+                "site": site_name,
+                "url": page.url,
+                "title": page.title,
+                "source": page.source,
+            }
+            for site_name, page in group
+        ]
+        groups.append({"url": key, "kept": copies[0], "duplicates": copies[1:]})
+    report = {
+        "mode": mode,
+        "urls": len(groups),
+        "duplicate_pages": sum(len(group["duplicates"]) for group in groups),
+        "groups": groups,
+    }
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def page_item_attrs(page, item_id):
+    """Attributes of a page's list item, marking flagged duplicates"""
+    if page.duplicate_of is None:
+        return f'class="page-item" id="{item_id}"'
+    return (
+        f'class="page-item duplicate" id="{item_id}" '
+        f'title="Also listed under {escape_html(format_site_name(page.duplicate_of))}"'
+    )
+
+
+def escape_html(text):
+    """html.escape() with a fast path for the common text that needs none"""
+    if HTML_SPECIAL.search(text) is None:
+        return text
+    return html.escape(text)
+
+
+class Template:
+    """Markup with {name} slots, parsed once for fast repeated rendering
+
+    The text is split into static chunks and slots once; render() fills the
+    slot positions of a copy of that list and joins it. Each value is
+    escaped once with escape_html(), however often its slot appears, except
+    for slots listed in raw, which take markup the caller has already
+    built. Values must be strings.
+    """
+
+    __slots__ = ("slots", "_parts", "_positions", "_escaped")
+
+    def __init__(self, text, raw=()):
+        self._parts = TEMPLATE_SLOT.split(text)
+        self._positions = tuple(
+            (index, self._parts[index]) for index in range(1, len(self._parts), 2)
+        )
+        self.slots = tuple(dict.fromkeys(name for _, name in self._positions))
+        self._escaped = tuple(name for name in self.slots if name not in raw)
+
+    def render(self, **values):
+        for name in self._escaped:
+            values[name] = escape_html(values[name])
+        parts = self._parts.copy()
+        for index, name in self._positions:
+            parts[index] = values[name]
+        return "".join(parts)
+
+
+def page_item_template(indent):
+    """Template of a page list item, indented to fit its surrounding markup"""
+    pad = " " * indent
+    return Template(
+        f"""
+{pad}<li {{attrs}}>
+{pad}    <div class="page-title">{{title}}</div>
+{pad}    <a href="{{url}}" class="page-url" target="_blank">{{url}}</a>
+{pad}    <div class="page-meta">{{meta}}</div>
+{pad}</li>
+""",
+        raw=("attrs",),
+    )
+
+
+# Page list items of site sections, URL hierarchies and folder subsections
+PAGE_ITEM = page_item_template(20)
+HIERARCHY_PAGE_ITEM = page_item_template(16)
+FOLDER_PAGE_ITEM = page_item_template(28)
+
+
+def render_page_item(template, page, item_id, meta):
+    """A page's list item markup from one of the page item templates"""
+    return template.render(
+        attrs=page_item_attrs(page, item_id),
+        title=page.title,
+        url=page.url or "#",
+        meta=meta,
+    )
+
+
+def local_meta(page):
+    """Meta line naming a page's local markdown file"""
+    return f"Local: {os.path.basename(page.local_file) if page.local_file else 'N/A'}"
+
+
+def hierarchy_meta(page):
+    """Meta line of a page in a URL hierarchy"""
+    return f"Depth: {page.depth} | {local_meta(page)}"
+
+
+def content_hash(path, previous):
+    """[hash, mtime_ns, size] of a markdown file, or None if it isn't a file
+
+    The hash from the previous snapshot is reused while mtime and size are
+    unchanged.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if previous is not None and previous[1:] == [st.st_mtime_ns, st.st_size]:
+        return previous
+    if not S_ISREG(st.st_mode):
+        return None
+    STATS.count("files_hashed")
+    return [hash_file(path)[:16], st.st_mtime_ns, st.st_size]
+
+
+def snapshot_sites(sites, docs_base, previous=None):
+    """Compact per-page records of this run, compared against by crawl_delta()
+
+    Returns {site: {url: [title, local file, content hash, mtime_ns, size]}}.
+    Pages without a URL are keyed by their local file, and relative local
+    files are resolved against the parent of docs_base.
+    """
+    # Hashes from the previous run, by local file
+    known = {}
+    if previous is not None:
+        for records in previous["sites"].values():
+            for _, local_file, *stamp in records.values():
+                if stamp[0] is not None:
+                    known[local_file] = stamp
+
+    # Files shared by many pages (TeamDynamix categories) are looked at once
+    stamps = {}
+    root = os.path.dirname(os.path.abspath(docs_base))
+    snapshot = {}
+    for site_name, site_data in sites.items():
+        records = snapshot[site_name] = {}
+        for page in site_data["pages"]:
+            key = page.url or page.local_file
+            if not key:
+                continue
+            local_file = page.local_file
+            if not local_file:
+                stamp = None
+            elif local_file in stamps:
+                stamp = stamps[local_file]
+            else:
+                stamp = stamps[local_file] = content_hash(
+                    os.path.join(root, local_file), known.get(local_file)
+                )
+            records[key] = [page.title, local_file, *(stamp or (None, None, None))]
+    return snapshot
+
+
+def crawl_delta(previous, current):
+    """Added, removed and modified pages per site between two snapshots
+
+    Each side is indexed by URL already, so the comparison is a single hash
+    join per site. Modified pages list which of title, local file and content
+    changed. Without a previous snapshot the run is only a baseline.
+    """
+    delta = {
+        "baseline": previous is None,
+        "previous_run": previous["created"] if previous else None,
+        "totals": {"added": 0, "removed": 0, "modified": 0},
+        "sites": {},
+    }
+    if previous is None:
+        return delta
+
+    old_sites = previous["sites"]
+    fields = ("title", "local_file", "content")
+    for site_name in [*current, *(name for name in old_sites if name not in current)]:
+        old = old_sites.get(site_name, {})
+        new = current.get(site_name, {})
+        added = [
+            {"url": key, "title": record[0]}
+            for key, record in new.items()
+            if key not in old
+        ]
+        removed = [
+            {"url": key, "title": record[0]}
+            for key, record in old.items()
+            if key not in new
+        ]
+        modified = []
+        for key, record in new.items():
+            before = old.get(key)
+            if before is None or before[:3] == record[:3]:
+                continue
+            changed = [
+                field for field, a, b in zip(fields, before[:3], record[:3]) if a != b
+            ]
+            modified.append({"url": key, "title": record[0], "changed": changed})
+        if added or removed or modified:
+            delta["sites"][site_name] = {
+                "added": added,
+                "removed": removed,
+                "modified": modified,
+            }
+            delta["totals"]["added"] += len(added)
+            delta["totals"]["removed"] += len(removed)
+            delta["totals"]["modified"] += len(modified)
+    return delta
+
+
+def load_snapshot(snapshot_file):
+    """Load the previous run's snapshot, or None if there is no usable one"""
+    try:
+        with open(snapshot_file, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or "sites" not in snapshot:
+        return None
+    # Rendered sections can only be reused with the same generator
+    if snapshot.get("generator") != generator_fingerprint():
+        snapshot["sections"] = {}
+    return snapshot
+
+
+def save_snapshot(snapshot_file, sites, sections):
+    """Atomically write this run's page records and rendered section cache"""
+    snapshot = {
+        "generator": generator_fingerprint(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "sites": sites,
+        "sections": sections,
+    }
+    tmp_file = Path(f"{snapshot_file}.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_file, snapshot_file)
+
+
+def section_pages(site_data, children):
+    """All pages a section is rendered from, in a stable order"""
+    pages = list(site_data["pages"])
+    for _, child_data in children:
+        pages.extend(child_data["pages"])
+    return pages
+
+
+def section_key(section_no, site_name, pages, children, variant=""):
+    """Hash of everything a section's rendered content depends on
+
+    variant names the output options that change the content (minified
+    markup, virtual list data), so switching them doesn't reuse old shards.
+    """
+    digest = hashlib.sha1(f"{section_no}\x1e{site_name}".encode("utf-8"))
+    if variant:
+        digest.update(f"\x1e{variant}".encode("utf-8"))
+    for child_name, child_data in children:
+        digest.update(f"\x1e{child_name}:{len(child_data['pages'])}".encode("utf-8"))
+    for page in pages:
+        fields = page.as_list()
+        fields.append(page.duplicate_of)
+        digest.update(("\x1e" + "\x1f".join(map(str, fields))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class UrlTrie:
+    """Node of a site's URL path trie
+
+    children maps each path segment to its node and pages holds the pages
+    directly below this level. After finalize() both are sorted and count
+    is the number of pages in the whole subtree.
+    """
+
+    __slots__ = ("children", "pages", "count")
+
+    def __init__(self):
+        self.children = {}
+        self.pages = []
+        self.count = 0
+
+    def finalize(self):
+        """Sort children and pages once and fill in subtree page counts"""
+        # Collect nodes parents-first, then settle them children-first; no
+        # recursion, so deep trees don't hit the recursion limit
+        order = [self]
+        for node in order:
+            order.extend(node.children.values())
+        for node in reversed(order):
+            count = len(node.pages)
+            if count > 1:
+                node.pages.sort(key=page_sort_key)
+            if node.children:
+                node.children = dict(sorted(node.children.items()))
+                count += sum(child.count for child in node.children.values())
+            node.count = count
+
+
+@lru_cache(maxsize=1 << 16)
+def split_url_dir(prefix):
+    """Netloc and path segments of a URL prefix (memoized, prefixes repeat a lot)"""
+    parsed = urlparse(prefix)
+    return parsed.netloc, tuple(
+        sys.intern(part) for part in parsed.path.split("/") if part
+    )
+
+
+def url_prefix(url):
+    """Everything in a URL up to the directory holding its last path segment"""
+    base = url.split("#", 1)[0].split("?", 1)[0].rstrip("/")
+    slash = base.rfind("/")
+    scheme_end = base.find("//")
+    if scheme_end != -1 and slash <= scheme_end + 1:
+        # Nothing below the host
+        return base
+    return base[: max(slash, 0)]
+
+
 def build_hierarchy(pages):
-    """Build hierarchical structure from flat page list"""
-    hierarchy = defaultdict(lambda: {"children": defaultdict(dict), "pages": []})
+    """Build a URL path trie per host from a flat page list"""
+    hierarchy = {}
+    # Pages mostly share directories, so remember the node for each prefix
+    nodes = {}
 
     for page in pages:
-        url = page.get("URL", "")
+        url = page.url
         if not url:
             continue
 
-        parsed = urlparse(url)
-        path_parts = [p for p in parsed.path.split("/") if p]
-
-        # Build nested structure
-        current = hierarchy[parsed.netloc]
-        for i, part in enumerate(path_parts[:-1]):
-            if part not in current["children"]:
-                current["children"][part] = {"children": defaultdict(dict), "pages": []}
-            current = current["children"][part]
+        prefix = url_prefix(url)
+        current = nodes.get(prefix)
+        if current is None:
+            netloc, directories = split_url_dir(prefix)
+
+            # Build nested structure
+            current = hierarchy.get(netloc)
+            if current is None:
+                current = hierarchy[netloc] = UrlTrie()
+            for part in directories:
+                child = current.children.get(part)
+                if child is None:
+                    child = current.children[part] = UrlTrie()
+                current = child
+            nodes[prefix] = current
 
         # Add page to appropriate level
-        current["pages"].append(page)
+        current.pages.append(page)
 
+    for root in hierarchy.values():
+        root.finalize()
     return hierarchy
 
 
@@ -450,16 +1742,9 @@ def format_site_name(name):
     return name_map.get(name, name.replace("-", " ").replace("_", " ").title())
 
 
-def generate_html(sites):
-    """Generate interactive HTML documentation"""
-
-    html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>CAES Chatbot - Crawled Content Documentation</title>
-    <style>
+# Stylesheet and script of the generated page, inlined by default and written
+# to content-hashed files in ASSET_DIR_NAME with --minify
+PAGE_STYLE = """
         * {
             margin: 0;
             padding: 0;
@@ -621,6 +1906,16 @@ def generate_html(sites):
             background: #f0f0f0;
         }
 
+        .page-item.duplicate {
+            opacity: 0.6;
+        }
+
+        .page-item.duplicate .page-title::after {
+            content: " (duplicate)";
+            font-weight: normal;
+            color: #666;
+        }
+
         .page-title {
             font-weight: 600;
             color: #333;
@@ -666,6 +1961,44 @@ def generate_html(sites):
             border-color: #ba0c2f;
         }
 
+        .fulltext-toggle {
+            display: inline-block;
+            margin-top: 0.5rem;
+            font-size: 0.9rem;
+            color: #666;
+            cursor: pointer;
+        }
+
+        .search-box .fulltext-toggle input {
+            width: auto;
+            padding: 0;
+            margin-right: 0.25rem;
+        }
+
+        .fulltext-results {
+            list-style: none;
+        }
+
+        .fulltext-results:empty {
+            display: none;
+        }
+
+        .fulltext-result {
+            padding: 0.75rem 0;
+            border-bottom: 1px solid #eee;
+        }
+
+        .fulltext-snippet {
+            font-size: 0.9rem;
+            color: #444;
+            margin-top: 0.25rem;
+        }
+
+        .fulltext-snippet mark {
+            background: #fff3cd;
+            color: inherit;
+        }
+
         footer {
             text-align: center;
             padding: 2rem;
@@ -699,365 +2032,291 @@ def generate_html(sites):
         .expand-all:hover {
             background: #8b0000;
         }
-    </style>
-</head>
-<body>
-    <header>
-        <div class="container">
-            <h1>CAES Chatbot Documentation</h1>
-            <p class="subtitle">Comprehensive index of all crawled content sources</p>
-        </div>
-    </header>
 
-    <div class="container">
-        <div class="stats">
-"""
+        .searching .page-item {
+            display: none;
+        }
 
-    # Calculate statistics
-    total_sites = len(sites)
-    total_pages = sum(len(site["pages"]) for site in sites.values())
+        .searching .page-item.search-match {
+            display: block;
+        }
 
-    html += f"""
-            <div class="stat-card">
-                <div class="stat-number">{total_sites}</div>
-                <div class="stat-label">Total Sites Crawled</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{total_pages:,}</div>
-                <div class="stat-label">Total Pages Indexed</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{datetime.now().strftime('%Y-%m-%d')}</div>
-                <div class="stat-label">Last Updated</div>
-            </div>
-        </div>
+        /* Virtual lists: fixed-height rows positioned in a scrolling viewport.
+           The page script lays rows out by the heights set here */
+        .virtual-list {
+            max-height: 70vh;
+            overflow-y: auto;
+            --virtual-page-row: 112px;
+            --virtual-group-row: 40px;
+        }
 
-        <div class="search-box">
-            <input type="text" id="searchInput" placeholder="Search pages by title or URL...">
-            <div id="searchResults" style="margin-top: 0.5rem; font-size: 0.9rem; color: #666;"></div>
-        </div>
+        .virtual-spacer {
+            position: relative;
+        }
 
-        <button class="expand-all" onclick="toggleAll()">Expand All Sites</button>
+        .virtual-list .page-item,
+        .virtual-list .subsection-header {
+            position: absolute;
+            left: 0;
+            right: 0;
+            margin: 0;
+            overflow: hidden;
+        }
 
-        <div id="sitesContainer">
-"""
+        /* The gap below a page is part of its row, a transparent border */
+        .virtual-list .page-item {
+            display: block;
+            height: var(--virtual-page-row);
+            border-bottom: 0.5rem solid transparent;
+            background-clip: padding-box;
+        }
 
-    # Group sites to create nested structure
-    # Separate TeamDynamix parent and children
-    teamdynamix_parent = None
-    teamdynamix_children = []
-    # Separate GA Counts sections
-    gacounts_children = []
-    # Separate ETS sections
-    ets_children = []
-    other_sites = []
+        .virtual-list .subsection-header {
+            height: var(--virtual-group-row);
+            border-left: 3px solid #ba0c2f;
+            padding-left: 1rem;
+        }
 
-    for site_name, site_data in sorted(sites.items()):
-        if site_name == "teamdynamix":
-            teamdynamix_parent = (site_name, site_data)
-        elif site_name.startswith("teamdynamix/"):
-            teamdynamix_children.append((site_name, site_data))
-        elif site_name in ["gacounts-site", "dropbox"]:
-            # These will be children of GA Counts parent
-            gacounts_children.append((site_name, site_data))
-        elif site_name == "ets":
-            # Dropbox ETS folder - rename to ets-dropbox for cleaner display
-            ets_children.append(("ets-dropbox", site_data))
-        elif site_name == "ets-site":
-            # ETS crawler site
-            ets_children.append((site_name, site_data))
-        else:
-            other_sites.append((site_name, site_data))
-
-    # Generate content for each site
-    all_sites_to_render = other_sites.copy()
-
-    # If we have TeamDynamix parent, add it with children nested
-    if teamdynamix_parent:
-        all_sites_to_render.insert(0, teamdynamix_parent)
-
-    # Add GA Counts parent if we have children
-    if gacounts_children:
-        # Extract base URL and crawl date from children
-        base_url = "N/A"
-        crawl_date = "Unknown"
-
-        # Try to get from gacounts-site first, then dropbox
-        for child_name, child_data in gacounts_children:
-            if child_name == "gacounts-site":
-                base_url = child_data["summary"].get("base_url", base_url)
-                crawl_date = child_data.get("crawl_date", crawl_date)
-                break
+        .virtual-list .page-title,
+        .virtual-list .page-url,
+        .virtual-list .page-meta {
+            display: block;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+    """
+PAGE_SCRIPT = r"""
+        let allExpanded = false;
 
-        # Create a synthetic parent for GA Counts
-        gacounts_parent_data = {
-            "pages": [],
-            "summary": {"base_url": base_url},
-            "crawl_date": crawl_date,
-        }
-        all_sites_to_render.insert(0, ("gacounts", gacounts_parent_data))
-
-    # Add ETS parent if we have children
-    if ets_children:
-        # Extract base URL and crawl date from children
-        base_url = "N/A"
-        crawl_date = "Unknown"
-
-        # Try to get from ets-site first, then ets-dropbox
-        for child_name, child_data in ets_children:
-            if child_name == "ets-site":
-                base_url = child_data["summary"].get("base_url", base_url)
-                crawl_date = child_data.get("crawl_date", crawl_date)
-                break
+        // Sharded builds keep section content in separate files until first expand
+        function loadShard(content) {
+            const virtual = content.dataset.virtual !== undefined;
+            if (virtual && !content.dataset.shard && !content.virtualList) {
+                mountVirtualList(content, JSON.parse(content.querySelector('script').textContent));
+            }
+            if (!content.dataset.shard) return Promise.resolve();
+            if (!content.shardRequest) {
+                content.shardRequest = fetch(content.dataset.shard)
+                    .then(response => {
+                        if (!response.ok) throw new Error(response.statusText);
+                        return virtual ? response.json() : response.text();
+                    })
+                    .then(data => {
+                        if (virtual) mountVirtualList(content, data);
+                        else content.innerHTML = data;
+                        delete content.dataset.shard;
+                    })
+                    .catch(error => {
+                        content.shardRequest = null;
+                        content.textContent = 'Failed to load section: ' + error.message;
+                    });
+            }
+            return content.shardRequest;
+        }
 
-        # Create a synthetic parent for ETS
-        ets_parent_data = {
-            "pages": [],
-            "summary": {"base_url": base_url},
-            "crawl_date": crawl_date,
+        function loadAllShards() {
+            const pending = document.querySelectorAll('.site-content[data-shard], .site-content[data-virtual]');
+            return Promise.all(Array.from(pending, loadShard));
         }
-        all_sites_to_render.insert(0, ("ets", ets_parent_data))
 
-    for site_name, site_data in all_sites_to_render:
-        display_name = format_site_name(site_name)
-        # For TeamDynamix parent, calculate total from all children and extract base URL
-        if site_name == "teamdynamix":
-            page_count = sum(
-                len(child_data["pages"]) for _, child_data in teamdynamix_children
-            )
-            # Extract base URL and crawl date
-            base_url = "https://uga.teamdynamix.com"
+        // Virtual lists (--virtual-lists): a section's pages arrive as the nested
+        // lists built by section_tree() in generate_site.py, and only the rows
+        // scrolled into view exist in the DOM
+        const VIRTUAL_OVERSCAN = 8;
+
+        function mountVirtualList(content, nodes) {
+            const list = {
+                nodes: nodes,
+                docs: [],            // pages in the order their search documents are numbered
+                parents: new Map(),  // page or group -> enclosing group
+                expanded: new Set(),
+                matches: null,       // pages and groups shown while searching
+                matchGroups: null,
+                rows: [],
+                offsets: [],
+                rowHeight: null,     // px per kind of row, read from the stylesheet
+                frame: null,
+            };
+
+            // Depth-first, pages before subgroups: the order section_tree() assigns ids in
+            const stack = nodes.slice().reverse().map(node => [node, null]);
+            while (stack.length) {
+                const [node, parent] = stack.pop();
+                node[0].forEach(page => {
+                    list.docs.push(page);
+                    if (parent) list.parents.set(page, parent);
+                });
+                for (let i = node[1].length - 1; i >= 0; i--) {
+                    const group = node[1][i];
+                    if (parent) list.parents.set(group, parent);
+                    stack.push([group[3], group]);
+                }
+            }
 
-            # Get crawl date from summary
-            if site_data["summary"].get("structure") == "folders":
-                crawl_date = site_data["summary"].get("crawled", "Unknown")
-            else:
-                crawl_date = site_data.get("crawl_date", "Unknown")
-        # For GA Counts parent, calculate total from all children
-        elif site_name == "gacounts":
-            page_count = sum(
-                len(child_data["pages"]) for _, child_data in gacounts_children
-            )
-            base_url = site_data["summary"].get("base_url", "N/A")
-        # For ETS parent, calculate total from all children
-        elif site_name == "ets":
-            page_count = sum(len(child_data["pages"]) for _, child_data in ets_children)
-            base_url = site_data["summary"].get("base_url", "N/A")
-        else:
-            page_count = len(site_data["pages"])
-            base_url = site_data["summary"].get("base_url", "N/A")
+            list.viewport = document.createElement('div');
+            list.viewport.className = 'virtual-list';
+            list.spacer = document.createElement('div');
+            list.spacer.className = 'virtual-spacer';
+            list.viewport.appendChild(list.spacer);
+            list.viewport.addEventListener('scroll', () => {
+                if (!list.frame) list.frame = requestAnimationFrame(() => renderVirtualList(list));
+            });
+            list.viewport.addEventListener('click', event => {
+                const header = event.target.closest('.subsection-header');
+                if (!header) return;
+                const group = list.rows[header.dataset.row].group;
+                if (!list.expanded.delete(group)) list.expanded.add(group);
+                layoutVirtualList(list);
+            });
+            content.replaceChildren(list.viewport);
+            content.virtualList = list;
+            const style = getComputedStyle(list.viewport);
+            list.rowHeight = {
+                page: parseFloat(style.getPropertyValue('--virtual-page-row')),
+                group: parseFloat(style.getPropertyValue('--virtual-group-row')),
+            };
+            layoutVirtualList(list);
+        }
 
-        crawl_date = site_data.get("crawl_date", "Unknown")
+        // Flatten the groups that are open into rows and their offsets
+        function layoutVirtualList(list) {
+            const rows = [];
+            const offsets = [];
+            let height = 0;
+            const add = (row, kind) => {
+                rows.push(row);
+                offsets.push(height);
+                height += list.rowHeight[kind];
+            };
+
+            const stack = list.nodes.slice().reverse().map(node => ({ node: node, depth: 0 }));
+            while (stack.length) {
+                const entry = stack.pop();
+                if (entry.group) {
+                    add(entry, 'group');
+                    continue;
+                }
+                entry.node[0].forEach(page => {
+                    if (!list.matches || list.matches.has(page)) add({ page: page, depth: entry.depth }, 'page');
+                });
+                for (let i = entry.node[1].length - 1; i >= 0; i--) {
+                    const group = entry.node[1][i];
+                    if (list.matchGroups && !list.matchGroups.has(group)) continue;
+                    if (list.expanded.has(group)) stack.push({ node: group[3], depth: entry.depth + 1 });
+                    stack.push({ group: group, depth: entry.depth });
+                }
+            }
 
-        if crawl_date != "Unknown":
-            try:
-                crawl_date = datetime.fromisoformat(
-                    crawl_date.replace("Z", "+00:00")
-                ).strftime("%Y-%m-%d")
-            except:
-                pass
+            list.rows = rows;
+            list.offsets = offsets;
+            list.spacer.style.height = height + 'px';
+            renderVirtualList(list);
+        }
 
-        html += f"""
-            <div class="site-section" data-site="{site_name}">
-                <div class="site-header" onclick="toggleSite('{site_name}')">
-                    <div>
-                        <h2>{display_name}<span class="badge">{page_count} pages</span></h2>
-                        <div class="site-meta">
-                            Base URL: {base_url} | Crawled: {crawl_date}
-                        </div>
-                    </div>
-                    <span class="toggle-icon">▼</span>
-                </div>
-                <div class="site-content" id="content-{site_name}">
-"""
+        function renderVirtualList(list) {
+            list.frame = null;
+            const top = list.viewport.scrollTop;
+            // A list that is still hidden renders a window's worth of rows
+            const bottom = top + (list.viewport.clientHeight || window.innerHeight);
+
+            // First row that starts after the top of the viewport
+            let lo = 0;
+            let hi = list.rows.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (list.offsets[mid] <= top) lo = mid + 1;
+                else hi = mid;
+            }
+            const start = Math.max(0, lo - 1 - VIRTUAL_OVERSCAN);
+            let end = lo;
+            while (end < list.rows.length && list.offsets[end] < bottom) end++;
+            end = Math.min(list.rows.length, end + VIRTUAL_OVERSCAN);
+
+            const elements = [];
+            for (let i = start; i < end; i++) elements.push(virtualRowElement(list, i));
+            list.spacer.replaceChildren(...elements);
+        }
 
-        # If this is teamdynamix parent, render children as subsections
-        if site_name == "teamdynamix":
-            for child_name, child_data in teamdynamix_children:
-                child_display_name = format_site_name(child_name)
-                child_page_count = len(child_data["pages"])
+        function virtualRowElement(list, index) {
+            const row = list.rows[index];
+            const element = document.createElement('div');
+            element.style.top = list.offsets[index] + 'px';
+            element.style.left = row.depth + 'rem';
+
+            if (row.group) {
+                const [label, count, unit] = row.group;
+                element.className = 'subsection-header';
+                element.dataset.row = index;
+                const arrow = document.createElement('span');
+                arrow.textContent = list.expanded.has(row.group) ? '▼' : '▶';
+                const badge = document.createElement('span');
+                badge.className = 'badge';
+                badge.textContent = count + ' ' + unit;
+                element.append(arrow, ' ' + label + ' ', badge);
+                return element;
+            }
 
-                html += f"""
-                <div class="subsection">
-                    <div class="subsection-header" onclick="toggleSubsection('content-{child_name}')">
-                        <span>▶</span> {child_display_name} <span class="badge">{child_page_count} pages</span>
-                    </div>
-                    <div class="subsection-content" id="content-{child_name}">
-"""
-                # Render child pages as flat list (no hierarchy for TeamDynamix)
-                html += '<ul class="page-list">\n'
-                for page in sorted(
-                    child_data["pages"], key=lambda x: x.get("Title", "")
-                ):
-                    title = page.get("Title", "Untitled")
-                    url = page.get("URL", "#")
-                    local_file = page.get("Local File", "")
-
-                    html += f"""
-                    <li class="page-item">
-                        <div class="page-title">{title}</div>
-                        <a href="{url}" class="page-url" target="_blank">{url}</a>
-                        <div class="page-meta">Source: TeamDynamix KB</div>
-                    </li>
-"""
-                html += "</ul>\n"
+            const [title, url, meta, duplicateOf] = row.page;
+            element.className = 'page-item';
+            if (list.matches) element.classList.add('search-match');
+            if (duplicateOf) {
+                element.classList.add('duplicate');
+                element.title = 'Also listed under ' + duplicateOf;
+            }
+            const titleElement = document.createElement('div');
+            titleElement.className = 'page-title';
+            titleElement.textContent = title;
+            const link = document.createElement('a');
+            link.className = 'page-url';
+            link.href = url;
+            link.target = '_blank';
+            link.textContent = url;
+            const metaElement = document.createElement('div');
+            metaElement.className = 'page-meta';
+            metaElement.textContent = meta;
+            element.append(titleElement, link, metaElement);
+            return element;
+        }
 
-                html += """
-                    </div>
-                </div>
-"""
-        # If this is gacounts parent, render children as subsections
-        elif site_name == "gacounts":
-            for child_name, child_data in gacounts_children:
-                child_display_name = format_site_name(child_name)
-                child_page_count = len(child_data["pages"])
+        // Show only the given pages and the groups leading to them (null shows
+        // everything again, collapsed) and scroll to the first one
+        function filterVirtualList(list, pages) {
+            list.matches = list.matchGroups = null;
+            list.expanded = new Set();
+            if (pages !== null) {
+                list.matches = new Set(pages);
+                list.matchGroups = new Set();
+                pages.forEach(page => {
+                    for (let group = list.parents.get(page); group && !list.matchGroups.has(group);
+                         group = list.parents.get(group)) {
+                        list.matchGroups.add(group);
+                    }
+                });
+                list.expanded = new Set(list.matchGroups);
+            }
+            list.viewport.scrollTop = 0;
+            layoutVirtualList(list);
+            if (pages !== null && pages.length) {
+                list.viewport.scrollTop = list.offsets[list.rows.findIndex(row => row.page === pages[0])];
+            }
+        }
 
-                html += f"""
-                <div class="subsection">
-                    <div class="subsection-header" onclick="toggleSubsection('content-{child_name}')">
-                        <span>▶</span> {child_display_name} <span class="badge">{child_page_count} pages</span>
-                    </div>
-                    <div class="subsection-content" id="content-{child_name}">
-"""
-                # Render child pages as flat list
-                html += '<ul class="page-list">\n'
-                for page in sorted(
-                    child_data["pages"], key=lambda x: x.get("Title", "")
-                ):
-                    title = page.get("Title", "Untitled")
-                    url = page.get("URL", "#")
-                    local_file = page.get("Local File", "")
-
-                    html += f"""
-                    <li class="page-item">
-                        <div class="page-title">{title}</div>
-                        <a href="{url}" class="page-url" target="_blank">{url}</a>
-                        <div class="page-meta">Local: {Path(local_file).name if local_file else 'N/A'}</div>
-                    </li>
-"""
-                html += "</ul>\n"
+        function virtualLists() {
+            return Array.from(document.querySelectorAll('.site-content'), content => content.virtualList)
+                .filter(list => list);
+        }
 
-                html += """
-                    </div>
-                </div>
-"""
-        # If this is ETS parent, render children as subsections
-        elif site_name == "ets":
-            for child_name, child_data in ets_children:
-                child_display_name = format_site_name(child_name)
-                child_page_count = len(child_data["pages"])
+        function expandSite(content) {
+            content.classList.add('expanded');
+            content.parentElement.querySelector('.toggle-icon').classList.add('expanded');
+        }
 
-                html += f"""
-                <div class="subsection">
-                    <div class="subsection-header" onclick="toggleSubsection('content-{child_name}')">
-                        <span>▶</span> {child_display_name} <span class="badge">{child_page_count} pages</span>
-                    </div>
-                    <div class="subsection-content" id="content-{child_name}">
-"""
-                # Render child pages as flat list
-                html += '<ul class="page-list">\n'
-                for page in sorted(
-                    child_data["pages"], key=lambda x: x.get("Title", "")
-                ):
-                    title = page.get("Title", "Untitled")
-                    url = page.get("URL", "#")
-                    local_file = page.get("Local File", "")
-
-                    html += f"""
-                    <li class="page-item">
-                        <div class="page-title">{title}</div>
-                        <a href="{url}" class="page-url" target="_blank">{url}</a>
-                        <div class="page-meta">Local: {Path(local_file).name if local_file else 'N/A'}</div>
-                    </li>
-"""
-                html += "</ul>\n"
-
-                html += """
-                    </div>
-                </div>
-"""
-        # Group pages by path hierarchy for better organization
-        elif site_name == "dropbox/intranet-files":
-            # Group by folder for intranet files
-            from collections import defaultdict
-
-            folders = defaultdict(list)
-            for page in site_data["pages"]:
-                folder = page.get("Folder", "uncategorized")
-                folders[folder].append(page)
-
-            # Render each folder as a subsection
-            for folder_name in sorted(folders.keys()):
-                files = folders[folder_name]
-                # Format folder name
-                display_folder = folder_name.replace("_", " ").title()
-
-                html += f"""
-                <div class="subsection">
-                    <div class="subsection-header" onclick="toggleSubsection('content-dropbox-{folder_name}')">
-                        <span>▶</span> {display_folder} <span class="badge">{len(files)} files</span>
-                    </div>
-                    <div class="subsection-content" id="content-dropbox-{folder_name}">
-                        <ul class="page-list">
-"""
-                for page in sorted(files, key=lambda x: x.get("Title", "")):
-                    title = page.get("Title", "Untitled")
-                    url = page.get("URL", "#")
-
-                    html += f"""
-                            <li class="page-item">
-                                <div class="page-title">{title}</div>
-                                <a href="{url}" class="page-url" target="_blank">{url}</a>
-                                <div class="page-meta">Source: Dropbox Intranet Files</div>
-                            </li>
-"""
-                html += """
-                        </ul>
-                    </div>
-                </div>
-"""
-        elif site_name == "ets":
-            # ETS files are from Dropbox - render as flat list
-            html += '<ul class="page-list">\n'
-            for page in sorted(site_data["pages"], key=lambda x: x.get("Title", "")):
-                title = page.get("Title", "Untitled")
-                url = page.get("URL", "#")
-                local_file = page.get("Local File", "")
-
-                html += f"""
-                    <li class="page-item">
-                        <div class="page-title">{title}</div>
-                        <a href="{url}" class="page-url" target="_blank">{url}</a>
-                        <div class="page-meta">Source: Dropbox (ETS Resources)</div>
-                    </li>
-"""
-            html += "</ul>\n"
-        else:
-            # Hierarchical display for websites
-            hierarchy = build_hierarchy(site_data["pages"])
-            html += render_hierarchy(hierarchy, site_name)
-
-        html += """
-                </div>
-            </div>
-"""
-
-    html += """
-        </div>
-    </div>
-
-    <footer>
-        <p>Generated by CAES Chatbot Documentation Generator</p>
-        <p>University of Georgia - College of Agricultural & Environmental Sciences</p>
-    </footer>
-
-    <script>
-        let allExpanded = false;
-
-        function toggleSite(siteName) {
-            const content = document.getElementById('content-' + siteName);
-            const icon = event.currentTarget.querySelector('.toggle-icon');
+        function toggleSite(siteName) {
+            const content = document.getElementById('content-' + siteName);
+            const icon = event.currentTarget.querySelector('.toggle-icon');
 
+            loadShard(content);
             content.classList.toggle('expanded');
             icon.classList.toggle('expanded');
         }
@@ -1071,6 +2330,7 @@ def generate_html(sites):
 
         function toggleAll() {
             allExpanded = !allExpanded;
+            if (allExpanded) loadAllShards();
             const sections = document.querySelectorAll('.site-content');
             const icons = document.querySelectorAll('.toggle-icon');
 
@@ -1094,9 +2354,419 @@ def generate_html(sites):
         }
 
         // Search functionality
+        let searchTimer = null;
+
         document.getElementById('searchInput').addEventListener('input', function(e) {
-            const searchTerm = e.target.value.toLowerCase().trim();
-            const pageItems = document.querySelectorAll('.page-item');
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const searchTerm = e.target.value.toLowerCase().trim();
+                if (fulltextEnabled()) {
+                    fulltextSearch(searchTerm);
+                    return;
+                }
+                loadSearchIndex().then(
+                    index => indexSearch(index, searchTerm),
+                    // No prebuilt index (e.g. opened from file://) - scan the page instead
+                    () => loadAllShards().then(() => runSearch(searchTerm))
+                );
+            }, 100);
+        });
+
+        // Prebuilt search index written by build_search_index() in generate_site.py
+        let searchIndexRequest = null;
+
+        function loadSearchIndex() {
+            if (!SEARCH_INDEX_URL) return Promise.reject(new Error('No search index'));
+            if (!searchIndexRequest) {
+                searchIndexRequest = fetch(SEARCH_INDEX_URL)
+                    .then(response => {
+                        if (!response.ok) throw new Error(response.statusText);
+                        return response.json();
+                    })
+                    .then(index => {
+                        // Decode each section's delta-encoded postings once
+                        index.sections.forEach(([, , sectionIndex]) => {
+                            sectionIndex.postings = sectionIndex.postings.map(deltas => {
+                                let doc = 0;
+                                return deltas.map(delta => (doc += delta));
+                            });
+                        });
+                        return index;
+                    });
+            }
+            return searchIndexRequest;
+        }
+
+        function tokenize(text) {
+            return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+        }
+
+        // Index of the first term that sorts at or after prefix
+        function lowerBound(terms, prefix) {
+            let lo = 0;
+            let hi = terms.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (terms[mid] < prefix) lo = mid + 1;
+                else hi = mid;
+            }
+            return lo;
+        }
+
+        // Documents where every query token is a prefix of one of their terms
+        function queryIndex(index, searchTerm) {
+            let result = null;
+            for (const token of tokenize(searchTerm)) {
+                const matches = new Set();
+                for (let i = lowerBound(index.terms, token);
+                     i < index.terms.length && index.terms[i].startsWith(token); i++) {
+                    index.postings[i].forEach(doc => {
+                        if (result === null || result.has(doc)) matches.add(doc);
+                    });
+                }
+                result = matches;
+                if (result.size === 0) break;
+            }
+            return result === null ? [] : Array.from(result).sort((a, b) => a - b);
+        }
+
+        // Matching pages of every section, in page order, with their element ids
+        function searchSections(index, searchTerm) {
+            const hits = [];
+            index.sections.forEach(([section, , sectionIndex], sectionNo) => {
+                queryIndex(sectionIndex, searchTerm).forEach(doc => {
+                    hits.push({ section: section, id: 'p' + sectionNo + '-' + doc, position: doc });
+                });
+            });
+            return hits;
+        }
+
+        // Full-text search over page content, written by write_fulltext_index()
+        // in generate_site.py. The manifest is loaded the first time it is used,
+        // each site's shard the first time a query can match one of its terms
+        const FULLTEXT_LIMIT = 50;
+        const FULLTEXT_PREFIX_CHARS = 2;
+        const BM25_K1 = 1.2;
+        const BM25_B = 0.75;
+        let fulltextRequest = null;
+
+        function fulltextEnabled() {
+            const toggle = document.getElementById('fulltextToggle');
+            return Boolean(toggle && toggle.checked);
+        }
+
+        function fetchJson(url) {
+            return fetch(url).then(response => {
+                if (!response.ok) throw new Error(response.statusText);
+                return response.json();
+            });
+        }
+
+        function loadFulltext() {
+            if (!fulltextRequest) {
+                fulltextRequest = fetchJson(FULLTEXT_INDEX_URL).then(manifest => {
+                    const docCount = manifest.sites.reduce((sum, entry) => sum + entry[3], 0);
+                    const totalLength = manifest.sites.reduce((sum, entry) => sum + entry[4], 0);
+                    const sites = manifest.sites.map(([site, name, url, , , , prefixes]) => (
+                        { site: site, name: name, url: url, prefixes: new Set(prefixes.split(' ')), request: null }
+                    ));
+                    // shards[i] is filled in once sites[i] has been loaded
+                    return { sites: sites, shards: [], docCount: docCount, averageLength: totalLength / Math.max(docCount, 1) };
+                });
+                // Allow a retry after a failed load
+                fulltextRequest.catch(() => { fulltextRequest = null; });
+            }
+            return fulltextRequest;
+        }
+
+        // Whether a site has terms starting with token, going by their prefixes
+        function siteMatches(site, token) {
+            const chars = Array.from(token);
+            if (chars.length >= FULLTEXT_PREFIX_CHARS) {
+                return site.prefixes.has(chars.slice(0, FULLTEXT_PREFIX_CHARS).join(''));
+            }
+            return Array.from(site.prefixes).some(prefix => prefix.startsWith(token));
+        }
+
+        // Loads the shards of every site with a term some token can expand to,
+        // so document frequencies summed over the loaded shards stay exact
+        function loadShards(fulltext, tokens) {
+            const requests = [];
+            fulltext.sites.forEach((site, siteNo) => {
+                if (!tokens.some(token => siteMatches(site, token))) return;
+                if (!site.request) {
+                    site.request = fetchJson(site.url).then(shard => {
+                        // Postings stay encoded until a query reaches their term
+                        const terms = [];
+                        const postings = [];
+                        for (let i = 0; i < shard.index.length; i += 2) {
+                            terms.push(shard.index[i]);
+                            postings.push(shard.index[i + 1]);
+                        }
+                        fulltext.shards[siteNo] = { site: site.site, name: site.name, docs: shard.docs, terms: terms, postings: postings };
+                    });
+                    // Allow a retry after a failed load
+                    site.request.catch(() => { site.request = null; });
+                }
+                requests.push(site.request);
+            });
+            return Promise.all(requests).then(() => fulltext);
+        }
+
+        // Interleaved [doc, term frequency, ...] from base64 varints of doc deltas
+        function decodePostings(shard, i) {
+            if (typeof shard.postings[i] !== 'string') return shard.postings[i];
+            const bytes = atob(shard.postings[i]);
+            const values = [];
+            let value = 0;
+            let shift = 0;
+            for (let k = 0; k < bytes.length; k++) {
+                const byte = bytes.charCodeAt(k);
+                value += (byte & 127) * 2 ** shift;
+                if (byte & 128) {
+                    shift += 7;
+                } else {
+                    values.push(value);
+                    value = 0;
+                    shift = 0;
+                }
+            }
+            for (let k = 2; k < values.length; k += 2) values[k] += values[k - 2];
+            return (shard.postings[i] = values);
+        }
+
+        // Documents containing every query token (as a term prefix), ranked by
+        // BM25 with document frequencies taken across the loaded shards
+        function rankFulltext(fulltext, tokens) {
+            let scores = null;
+            for (const token of tokens) {
+                const expansions = fulltext.shards.map(shard => {
+                    const matches = [];
+                    for (let i = lowerBound(shard.terms, token);
+                         i < shard.terms.length && shard.terms[i].startsWith(token); i++) {
+                        matches.push(i);
+                    }
+                    return matches;
+                });
+                const frequencies = new Map();
+                expansions.forEach((matches, shardNo) => matches.forEach(i => {
+                    const term = fulltext.shards[shardNo].terms[i];
+                    const count = decodePostings(fulltext.shards[shardNo], i).length / 2;
+                    frequencies.set(term, (frequencies.get(term) || 0) + count);
+                }));
+
+                const tokenScores = new Map();
+                expansions.forEach((matches, shardNo) => matches.forEach(i => {
+                    const shard = fulltext.shards[shardNo];
+                    const df = frequencies.get(shard.terms[i]);
+                    const idf = Math.log(1 + (fulltext.docCount - df + 0.5) / (df + 0.5));
+                    const values = decodePostings(shard, i);
+                    for (let k = 0; k < values.length; k += 2) {
+                        const key = shardNo + ':' + values[k];
+                        if (scores !== null && !scores.has(key)) continue;
+                        const tf = values[k + 1];
+                        const norm = 1 - BM25_B + BM25_B * shard.docs[values[k]][3] / fulltext.averageLength;
+                        const score = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm);
+                        tokenScores.set(key, (tokenScores.get(key) || 0) + score);
+                    }
+                }));
+                if (scores !== null) tokenScores.forEach((score, key) => tokenScores.set(key, score + scores.get(key)));
+                scores = tokenScores;
+                if (scores.size === 0) break;
+            }
+            return Array.from(scores || []).sort((a, b) => b[1] - a[1]);
+        }
+
+        // Excerpt text around the first matching word, with matches marked
+        function snippetElement(text, tokens) {
+            const snippet = document.createElement('div');
+            snippet.className = 'fulltext-snippet';
+            const matchesToken = word => tokens.some(token => word.toLowerCase().startsWith(token));
+            const words = Array.from(text.matchAll(/[\p{L}\p{N}]+/gu));
+            const first = words.find(word => matchesToken(word[0]));
+            let start = first ? Math.max(0, first.index - 60) : 0;
+            let end = Math.min(text.length, start + 200);
+            let last = start;
+            if (start > 0) snippet.append('…');
+            words.forEach(word => {
+                if (word.index < start || word.index + word[0].length > end || !matchesToken(word[0])) return;
+                const mark = document.createElement('mark');
+                mark.textContent = word[0];
+                snippet.append(text.slice(last, word.index), mark);
+                last = word.index + word[0].length;
+            });
+            snippet.append(text.slice(last, end));
+            if (end < text.length) snippet.append('…');
+            return snippet;
+        }
+
+        function fulltextResultElement(shard, doc, tokens) {
+            const [title, url, file, , excerpt] = shard.docs[doc];
+            const item = document.createElement('li');
+            item.className = 'fulltext-result';
+            const link = document.createElement('a');
+            link.className = 'page-title';
+            link.href = url;
+            link.target = '_blank';
+            link.textContent = title;
+            const meta = document.createElement('div');
+            meta.className = 'page-meta';
+            meta.textContent = shard.name + ' · ' + file;
+            item.append(link, meta, snippetElement(excerpt, tokens));
+            return item;
+        }
+
+        function fulltextSearch(searchTerm) {
+            const searchResults = document.getElementById('searchResults');
+            const list = document.getElementById('fulltextResults');
+            if (searchTerm.length === 0) {
+                list.replaceChildren();
+                searchResults.textContent = '';
+                return;
+            }
+            const tokens = tokenize(searchTerm);
+            loadFulltext().then(fulltext => loadShards(fulltext, tokens)).then(fulltext => {
+                // A newer search has started in the meantime
+                if (!fulltextEnabled() ||
+                    document.getElementById('searchInput').value.toLowerCase().trim() !== searchTerm) return;
+                const ranked = rankFulltext(fulltext, tokens);
+                list.replaceChildren(...ranked.slice(0, FULLTEXT_LIMIT).map(([key]) => {
+                    const [shardNo, doc] = key.split(':').map(Number);
+                    return fulltextResultElement(fulltext.shards[shardNo], doc, tokens);
+                }));
+                if (ranked.length === 0) {
+                    searchResults.textContent = 'No results found';
+                    searchResults.style.color = '#d32f2f';
+                } else {
+                    const shown = ranked.length > FULLTEXT_LIMIT ? ` (showing the top ${FULLTEXT_LIMIT})` : '';
+                    searchResults.textContent = `Found ${ranked.length} page${ranked.length !== 1 ? 's' : ''} mentioning it${shown}`;
+                    searchResults.style.color = '#2e7d32';
+                }
+            }, error => {
+                searchResults.textContent = 'Page content search is unavailable: ' + error.message;
+                searchResults.style.color = '#d32f2f';
+            });
+        }
+
+        // Switching modes clears the other mode's results and searches again
+        const fulltextToggle = document.getElementById('fulltextToggle');
+        if (fulltextToggle) {
+            fulltextToggle.addEventListener('change', () => {
+                const input = document.getElementById('searchInput');
+                if (fulltextToggle.checked) {
+                    searchMatches.forEach(item => item.classList.remove('search-match'));
+                    searchMatches = [];
+                    document.getElementById('sitesContainer').classList.remove('searching');
+                    runSearch('');
+                    fulltextSearch(input.value.toLowerCase().trim());
+                } else {
+                    document.getElementById('fulltextResults').replaceChildren();
+                    input.dispatchEvent(new Event('input'));
+                }
+            });
+        }
+
+        function setArrow(subsection, arrow) {
+            const header = subsection.previousElementSibling;
+            if (header && header.classList.contains('subsection-header')) {
+                const span = header.querySelector('span');
+                if (span) span.textContent = arrow;
+            }
+        }
+
+        function collapseExpanded() {
+            Array.from(document.getElementsByClassName('expanded')).forEach(element => {
+                if (!element.closest('#sitesContainer')) return;
+                element.classList.remove('expanded');
+                if (element.classList.contains('subsection-content')) setArrow(element, '▶');
+            });
+            virtualLists().forEach(list => {
+                if (list.matches || list.expanded.size) filterVirtualList(list, null);
+            });
+        }
+
+        // Expand every section and subsection that contains a matching page
+        function expandAncestors(item) {
+            for (let element = item.parentElement; element; element = element.parentElement) {
+                if (element.classList.contains('subsection-content')) {
+                    element.classList.add('expanded');
+                    setArrow(element, '▼');
+                } else if (element.classList.contains('site-content')) {
+                    expandSite(element);
+                    break;
+                }
+            }
+        }
+
+        // Pages highlighted by the last indexed search
+        let searchMatches = [];
+
+        function indexSearch(index, searchTerm) {
+            const container = document.getElementById('sitesContainer');
+            const searchResults = document.getElementById('searchResults');
+
+            const hits = searchTerm.length === 0 ? [] : searchSections(index, searchTerm);
+            const sections = new Set(hits.map(hit => hit.section));
+            const shards = Array.from(sections, name => loadShard(document.getElementById('content-' + name)));
+
+            return Promise.all(shards).then(() => {
+                // A newer search has started in the meantime
+                if (document.getElementById('searchInput').value.toLowerCase().trim() !== searchTerm) return;
+
+                searchMatches.forEach(item => item.classList.remove('search-match'));
+                searchMatches = [];
+                collapseExpanded();
+
+                if (searchTerm.length === 0) {
+                    container.classList.remove('searching');
+                    searchResults.textContent = '';
+                    return;
+                }
+
+                container.classList.add('searching');
+                let matchCount = 0;
+                let firstMatch = null;
+                // Hits in virtual lists filter the list data instead of the DOM
+                const virtualHits = new Map();
+                hits.forEach(hit => {
+                    const content = document.getElementById('content-' + hit.section);
+                    const list = content && content.virtualList;
+                    if (list) {
+                        if (!virtualHits.has(list)) virtualHits.set(list, [content]);
+                        virtualHits.get(list).push(list.docs[hit.position]);
+                        matchCount++;
+                        if (!firstMatch) firstMatch = list.viewport;
+                        return;
+                    }
+                    const item = document.getElementById(hit.id);
+                    if (!item) return;
+                    item.classList.add('search-match');
+                    searchMatches.push(item);
+                    expandAncestors(item);
+                    matchCount++;
+                    if (!firstMatch) firstMatch = item;
+                });
+                virtualHits.forEach(([content, ...pages], list) => {
+                    filterVirtualList(list, pages);
+                    expandSite(content);
+                });
+
+                if (matchCount === 0) {
+                    searchResults.textContent = 'No results found';
+                    searchResults.style.color = '#d32f2f';
+                } else {
+                    searchResults.textContent = `Found ${matchCount} result${matchCount !== 1 ? 's' : ''}`;
+                    searchResults.style.color = '#2e7d32';
+                    setTimeout(() => {
+                        firstMatch.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                    }, 100);
+                }
+            });
+        }
+
+        // Fallback search over every page in the DOM
+        function runSearch(searchTerm) {
+            const pageItems = document.querySelectorAll('.page-list .page-item');
             const siteSections = document.querySelectorAll('.site-section');
             const subsections = document.querySelectorAll('.subsection-content');
             const searchResults = document.getElementById('searchResults');
@@ -1111,6 +2781,7 @@ def generate_html(sites):
                     icon.classList.remove('expanded');
                 });
                 subsections.forEach(sub => sub.classList.remove('expanded'));
+                virtualLists().forEach(list => filterVirtualList(list, null));
                 searchResults.textContent = '';
                 return;
             }
@@ -1120,6 +2791,16 @@ def generate_html(sites):
             const sectionsWithMatches = new Set();
             const subsectionsWithMatches = new Set();
 
+            virtualLists().forEach(list => {
+                const pages = list.docs.filter(([title, url]) =>
+                    title.toLowerCase().includes(searchTerm) || url.toLowerCase().includes(searchTerm));
+                filterVirtualList(list, pages);
+                if (pages.length === 0) return;
+                matchCount += pages.length;
+                if (!firstMatch) firstMatch = list.viewport;
+                sectionsWithMatches.add(list.viewport.closest('.site-section'));
+            });
+
             pageItems.forEach(item => {
                 const title = item.querySelector('.page-title').textContent.toLowerCase();
                 const url = item.querySelector('.page-url').textContent.toLowerCase();
@@ -1193,79 +2874,1747 @@ def generate_html(sites):
                     firstMatch.scrollIntoView({ behavior: 'smooth', block: 'center' });
                 }, 100);
             }
-        });
+        }
+    """
+
+
+# Sites listed without a URL hierarchy, besides the teamdynamix/* children
+FLAT_LIST_SITES = {
+    "gacounts-site",
+    "dropbox",
+    "ets",
+    "ets-site",
+    "dropbox/intranet-files",
+}
+
+
+def group_sites(sites):
+    """Arrange sites into the sections of the page, in one pass
+
+    Returns (site name, site data, children) triples in page order. The
+    teamdynamix/* sites become children of the TeamDynamix section,
+    gacounts-site and dropbox of a synthetic GA Counts parent, and ets (as
+    ets-dropbox) and ets-site of a synthetic ETS parent; those three come
+    first. Pages rendered as flat or per-folder lists are sorted by
+    Page.sort_key here, in a copy of the site's data, so the renderers only
+    iterate; URL hierarchies sort each node as they are built.
+    """
+    teamdynamix = None
+    children = {"teamdynamix": [], "gacounts": [], "ets": []}
+    sections = []
+    for site_name, site_data in sorted(sites.items()):
+        if site_name in FLAT_LIST_SITES or site_name.startswith("teamdynamix/"):
+            site_data = dict(
+                site_data, pages=sorted(site_data["pages"], key=page_sort_key)
+            )
+        if site_name == "teamdynamix":
+            teamdynamix = site_data
+        elif site_name.startswith("teamdynamix/"):
+            children["teamdynamix"].append((site_name, site_data))
+        elif site_name in ("gacounts-site", "dropbox"):
+            children["gacounts"].append((site_name, site_data))
+        elif site_name == "ets":
+            # Dropbox ETS folder - rename to ets-dropbox for cleaner display
+            children["ets"].append(("ets-dropbox", site_data))
+        elif site_name == "ets-site":
+            children["ets"].append((site_name, site_data))
+        else:
+            sections.append((site_name, site_data, []))
+
+    parents = []
+    if children["ets"]:
+        parents.append(
+            ("ets", synthetic_parent(children["ets"], "ets-site"), children["ets"])
+        )
+    if children["gacounts"]:
+        parents.append(
+            (
+                "gacounts",
+                synthetic_parent(children["gacounts"], "gacounts-site"),
+                children["gacounts"],
+            )
+        )
+    # TeamDynamix children are only shown under their crawled parent
+    if teamdynamix is not None:
+        parents.append(("teamdynamix", teamdynamix, children["teamdynamix"]))
+    return parents + sections
+
+
+def synthetic_parent(children, primary):
+    """Site data for a parent section, with its primary child's base URL and date"""
+    base_url = "N/A"
+    crawl_date = "Unknown"
+    for child_name, child_data in children:
+        if child_name == primary:
+            base_url = child_data["summary"].get("base_url", base_url)
+            crawl_date = child_data.get("crawl_date", crawl_date)
+            break
+    return {"pages": [], "summary": {"base_url": base_url}, "crawl_date": crawl_date}
+
+
+def iter_html(
+    sites,
+    shard_dir=None,
+    search_index_file=None,
+    whats_new=None,
+    section_cache=None,
+    asset_dir=None,
+    virtual=False,
+    fulltext_url=None,
+    workers=1,
+):
+    """Generate interactive HTML documentation as a stream of chunks
+
+    The page header, each site section and the footer are yielded separately
+    as UTF-8 encoded bytes, so at most one section is held in memory at a
+    time. If shard_dir is given,
+    the page only contains the site headers and each section's content is
+    written to its own fragment file there, fetched the first time it is
+    expanded. If search_index_file is given, a prebuilt search index over all
+    rendered pages is written there for the page's search box to query.
+
+    whats_new is a crawl_delta() result rendered as a "What's new" section
+    above the sites. section_cache maps site names to the key, shard URL and
+    page order of sections rendered by an earlier run; with shard_dir set,
+    sections whose key still matches reuse their shard file instead of being
+    rendered again. It is updated in place for the next run.
+
+    If asset_dir is given the output is minified: the stylesheet and script
+    are written there as content-hashed files the page links to, and the page
+    and shard markup is stripped of indentation.
+
+    With virtual=True each section's pages are emitted as section_tree()
+    JSON instead of markup, inline or as the shard, and the page script
+    renders only the rows scrolled into view.
+
+    fulltext_url is the write_fulltext_index() manifest; if given, the search
+    box gets a toggle to search page content through it instead of titles.
+
+    Sections are rendered by render_sections(), on `workers` processes, and
+    still come out in page order.
+    """
+
+    if asset_dir is None:
+        finish = bytes
+        style_tag = f"<style>{PAGE_STYLE}</style>"
+        script_tag = f"<script>{PAGE_SCRIPT}</script>"
+    else:
+        finish = minify_markup
+        asset_files = set()
+        style_url = write_asset(
+            asset_dir, "site.css", minify_css(PAGE_STYLE), asset_files
+        )
+        script_url = write_asset(
+            asset_dir, "site.js", minify_script(PAGE_SCRIPT), asset_files
+        )
+        style_tag = f'<link rel="stylesheet" href="{style_url}">'
+        script_tag = f'<script src="{script_url}"></script>'
+        remove_stale_assets(asset_dir, asset_files)
+
+    yield finish(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>CAES Chatbot - Crawled Content Documentation</title>
+    {style_tag}
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1>CAES Chatbot Documentation</h1>
+            <p class="subtitle">Comprehensive index of all crawled content sources</p>
+        </div>
+    </header>
+
+    <div class="container">
+        <div class="stats">
+""".encode("utf-8"))
+
+    # Calculate statistics
+    total_sites = len(sites)
+    total_pages = sum(len(site["pages"]) for site in sites.values())
+
+    fulltext_toggle = fulltext_results = ""
+    if fulltext_url is not None:
+        fulltext_toggle = """
+            <label class="fulltext-toggle"><input type="checkbox" id="fulltextToggle"> Search page content</label>"""
+        fulltext_results = """
+            <ol id="fulltextResults" class="fulltext-results"></ol>"""
+
+    yield finish(f"""
+            <div class="stat-card">
+                <div class="stat-number">{total_sites}</div>
+                <div class="stat-label">Total Sites Crawled</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{total_pages:,}</div>
+                <div class="stat-label">Total Pages Indexed</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">{datetime.now().strftime('%Y-%m-%d')}</div>
+                <div class="stat-label">Last Updated</div>
+            </div>
+        </div>
+
+        <div class="search-box">
+            <input type="text" id="searchInput" placeholder="Search pages by title or URL...">{fulltext_toggle}
+            <div id="searchResults" style="margin-top: 0.5rem; font-size: 0.9rem; color: #666;"></div>{fulltext_results}
+        </div>
+
+        <button class="expand-all" onclick="toggleAll()">Expand All Sites</button>
+""".encode("utf-8"))
+
+    if whats_new is not None:
+        parts = []
+        render_whats_new(whats_new, parts.append)
+        yield finish("".join(parts).encode("utf-8"))
+
+    yield finish("""
+        <div id="sitesContainer">
+""".encode("utf-8"))
+
+    shard_files = set()
+    previous_sections = {}
+    if section_cache is not None:
+        previous_sections = dict(section_cache)
+        section_cache.clear()
+    # Headers and shard reuse are worked out first, so that the sections that
+    # do need rendering can all be handed to render_sections() up front
+    sections = []
+    jobs = []
+    for section_no, (site_name, site_data, children) in enumerate(group_sites(sites)):
+        display_name = format_site_name(site_name)
+        # For TeamDynamix parent, calculate total from all children and extract base URL
+        if site_name == "teamdynamix":
+            page_count = sum(len(child_data["pages"]) for _, child_data in children)
+            # Extract base URL and crawl date
+            base_url = "https://uga.teamdynamix.com"
+
+            # Get crawl date from summary
+            if site_data["summary"].get("structure") == "folders":
+                crawl_date = site_data["summary"].get("crawled", "Unknown")
+            else:
+                crawl_date = site_data.get("crawl_date", "Unknown")
+        # For GA Counts parent, calculate total from all children
+        elif site_name == "gacounts":
+            page_count = sum(len(child_data["pages"]) for _, child_data in children)
+            base_url = site_data["summary"].get("base_url", "N/A")
+        # For ETS parent, calculate total from all children
+        elif site_name == "ets":
+            page_count = sum(len(child_data["pages"]) for _, child_data in children)
+            base_url = site_data["summary"].get("base_url", "N/A")
+        else:
+            page_count = len(site_data["pages"])
+            base_url = site_data["summary"].get("base_url", "N/A")
+
+        crawl_date = site_data.get("crawl_date", "Unknown")
+
+        if crawl_date != "Unknown":
+            try:
+                crawl_date = datetime.fromisoformat(
+                    crawl_date.replace("Z", "+00:00")
+                ).strftime("%Y-%m-%d")
+            except:
+                pass
+
+        section_open = f"""
+            <div class="site-section" data-site="{site_name}">
+                <div class="site-header" onclick="toggleSite('{site_name}')">
+                    <div>
+                        <h2>{display_name}<span class="badge">{page_count} pages</span></h2>
+                        <div class="site-meta">
+                            Base URL: {base_url} | Crawled: {crawl_date}
+                        </div>
+                    </div>
+                    <span class="toggle-icon">▼</span>
+                </div>
+                <div class="site-content" id="content-{site_name}\""""
+
+        cached = key = pages = None
+        if shard_dir is not None and section_cache is not None:
+            pages = section_pages(site_data, children)
+            variant = " ".join(
+                name
+                for name, on in (("minified", asset_dir), ("virtual", virtual))
+                if on
+            )
+            key = section_key(section_no, site_name, pages, children, variant)
+            cached = previous_sections.get(site_name)
+            if cached is not None and (
+                cached["key"] != key
+                or not (shard_dir / shard_file_name(cached["shard"])).exists()
+            ):
+                cached = None
+
+        if cached is None:
+            jobs.append(
+                (
+                    section_no,
+                    site_name,
+                    site_data,
+                    children,
+                    virtual,
+                    shard_dir is not None and section_cache is not None,
+                    search_index_file is not None,
+                )
+            )
+        sections.append((site_name, section_open, cached, key, pages))
+
+    section_close = """
+                </div>
+            </div>
+"""
+    rendered = render_sections(jobs, workers)
+    search_sections = []
+    for site_name, section_open, cached, key, pages in sections:
+        section_started = time.perf_counter()
+        if cached is not None:
+            # Unchanged since the last run: keep its shard and search index,
+            # or rebuild the index from the recorded page order if it wasn't kept
+            STATS.count("sections_reused")
+            content = b""
+            order = cached["order"]
+            page_count = len(order)
+            STATS.count("pages_rendered", page_count)
+            search_index = cached.get("search")
+            if search_index is None and search_index_file is not None:
+                with STATS.phase("search_index"):
+                    search_index = json.dumps(
+                        build_search_index([pages[index] for index in order]),
+                        separators=(",", ":"),
+                    )
+            STATS.record_site(
+                site_name, render_seconds=time.perf_counter() - section_started
+            )
+        else:
+            content, page_count, order, search_index, phases, sites = next(rendered)()
+            STATS.merge(phases, sites)
+
+        if virtual:
+            section_open += " data-virtual"
+        if shard_dir is None:
+            if virtual:
+                content = b'<script type="application/json">' + content + b"</script>"
+            chunk = finish(
+                f"{section_open}>\n".encode("utf-8")
+                + content
+                + section_close.encode("utf-8")
+            )
+            section_bytes = len(chunk)
+        else:
+            # Only the header goes into the page, the content is fetched on expand
+            if cached is not None:
+                shard_url = cached["shard"]
+            else:
+                if not virtual:
+                    content = finish(content)
+                shard_url = write_shard(
+                    shard_dir, site_name, content, ".json" if virtual else ".html"
+                )
+            if section_cache is not None:
+                section_cache[site_name] = {
+                    "key": key,
+                    "shard": shard_url,
+                    "order": order,
+                    "search": search_index,
+                }
+            shard_files.add(shard_file_name(shard_url))
+            chunk = finish(
+                f'{section_open} data-shard="{shard_url}">\n{section_close}'.encode(
+                    "utf-8"
+                )
+            )
+            section_bytes = len(chunk) + len(content)
+
+        STATS.record_site(
+            site_name, pages_rendered=page_count, output_bytes=section_bytes
+        )
+        yield chunk
+
+        search_sections.append([site_name, page_count, search_index])
+    rendered.close()
+
+    if shard_dir is not None:
+        remove_stale_shards(shard_dir, shard_files)
+
+    search_index_url = None
+    if search_index_file is not None:
+        with STATS.phase("search_index"):
+            search_index_url = write_search_index(search_index_file, search_sections)
+    yield finish(f"""
+    <script>
+        const SEARCH_INDEX_URL = {json.dumps(search_index_url)};
+        const FULLTEXT_INDEX_URL = {json.dumps(fulltext_url)};
     </script>
+""".encode("utf-8"))
+
+    yield finish(f"""
+        </div>
+    </div>
+
+    <footer>
+        <p>Generated by CAES Chatbot Documentation Generator</p>
+        <p>University of Georgia - College of Agricultural & Environmental Sciences</p>
+    </footer>
+
+    {script_tag}
 </body>
 </html>
-"""
+""".encode("utf-8"))
 
-    return html
 
+def generate_html(sites, whats_new=None):
+    """Generate interactive HTML documentation"""
+    return b"".join(iter_html(sites, whats_new=whats_new)).decode("utf-8")
+
+
+def write_html(
+    sites,
+    output_file,
+    shards=False,
+    whats_new=None,
+    section_cache=None,
+    minify=False,
+    compress=False,
+    virtual=False,
+    fulltext_url=None,
+    workers=1,
+):
+    """Stream the generated documentation to output_file, returning bytes written
+
+    With shards=True, site sections are written as fragments to the
+    SHARD_DIR_NAME directory next to output_file. The search index is always
+    written next to output_file as SEARCH_INDEX_NAME. whats_new and
+    section_cache are passed on to iter_html().
+
+    With minify=True the markup is minified and the stylesheet and script are
+    written to the ASSET_DIR_NAME directory (see iter_html()). With
+    compress=True every file the page loads gets a gzip-compressed .gz
+    sibling for servers that serve precompressed files. With virtual=True
+    page lists are rendered by a virtual scroller from JSON section data.
+    fulltext_url links the page to a write_fulltext_index() index. Sections
+    are rendered on `workers` processes.
+    """
+    output_file = Path(output_file)
+    shard_dir = None
+    if shards:
+        shard_dir = output_file.parent / SHARD_DIR_NAME
+        shard_dir.mkdir(exist_ok=True)
+    else:
+        remove_generated_dir(output_file.parent / SHARD_DIR_NAME, remove_stale_shards)
+    asset_dir = None
+    if minify:
+        asset_dir = output_file.parent / ASSET_DIR_NAME
+        asset_dir.mkdir(exist_ok=True)
+    else:
+        remove_generated_dir(output_file.parent / ASSET_DIR_NAME, remove_stale_assets)
+
+    search_index_file = output_file.parent / SEARCH_INDEX_NAME
+
+    written = 0
+    # Streamed into a temporary file, so a failed render keeps the old page
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    try:
+        with STATS.phase("render_html"), open(tmp_file, "wb", buffering=1 << 20) as f:
+            for chunk in iter_html(
+                sites,
+                shard_dir,
+                search_index_file,
+                whats_new,
+                section_cache,
+                asset_dir,
+                virtual,
+                fulltext_url,
+                workers,
+            ):
+                written += f.write(chunk)
+            STATS.count("output_bytes", written)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_file, output_file)
+
+    artifacts = [output_file, search_index_file]
+    fulltext_dir = output_file.parent / FULLTEXT_DIR_NAME
+    if shard_dir is not None:
+        artifacts.extend(path for path in shard_dir.iterdir() if path.suffix != ".gz")
+    if fulltext_url:
+        artifacts.extend(fulltext_dir / name for name in fulltext_files(fulltext_dir))
+    if asset_dir is not None:
+        artifacts.extend(
+            path
+            for path in asset_dir.iterdir()
+            if ASSET_FILE.fullmatch(path.name) and path.suffix != ".gz"
+        )
+    with STATS.phase("compress"):
+        STATS.count("compressed_bytes", sync_gzip(artifacts, compress))
+    return written
+
+
+def write_shard(shard_dir, site_name, data, suffix=".html"):
+    """Write a site section's encoded content to its fragment file and return its URL
+
+    Unchanged shards are left untouched so the web server can keep serving
+    them from cache, and the content hash in the URL busts browser caches
+    only for sections that actually changed.
+    """
+    STATS.count("output_bytes", len(data))
+    file_name = site_name.replace("/", "--") + suffix
+    shard_file = shard_dir / file_name
+    if (
+        not shard_file.exists()
+        or shard_file.stat().st_size != len(data)
+        or shard_file.read_bytes() != data
+    ):
+        replace_file(shard_file, data)
+    return f"{SHARD_DIR_NAME}/{file_name}?v={hashlib.sha1(data).hexdigest()[:12]}"
+
+
+def replace_file(path, data):
+    """Write data to path through a temporary file, so it is never left partial"""
+    tmp_file = path.with_name(path.name + ".tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, path)
+
+
+def shard_file_name(shard_url):
+    """File name part of a URL returned by write_shard()"""
+    return shard_url.split("?")[0].split("/")[-1]
+
+
+def remove_stale_shards(shard_dir, keep):
+    """Delete fragment files for sites that are no longer generated"""
+    for shard_file in shard_dir.iterdir():
+        if shard_file.suffix in (".html", ".json") and shard_file.name not in keep:
+            shard_file.unlink()
+            gzip_path(shard_file).unlink(missing_ok=True)
+
+
+def remove_generated_dir(path, remove_stale):
+    """Delete an output directory left by a build with its option turned on
+
+    remove_stale clears the files the generator wrote there; the directory
+    itself is only removed once nothing else is left in it.
+    """
+    if not path.is_dir():
+        return
+    remove_stale(path, set())
+    try:
+        path.rmdir()
+    except OSError:
+        pass
+
+
+def minify_markup(data):
+    """Strip indentation and blank lines from encoded markup
+
+    Line breaks are kept, so whitespace between inline elements still renders
+    the same. The generated pages have no <pre> or <textarea> content.
+    """
+    return MARKUP_INDENT.sub(b"\n", data)
+
+
+def minify_css(css):
+    """Drop comments and spacing that doesn't matter from a stylesheet"""
+    css = CSS_SPACE.sub(
+        lambda m: m.group(1) or m.group(2) or " ", CSS_COMMENT.sub("", css)
+    )
+    return css.replace(";}", "}").strip()
+
+
+def minify_script(script):
+    """Drop indentation, blank lines and whole-line // comments from a script
+
+    Line breaks are kept so automatic semicolon insertion sees the same code.
+    """
+    lines = (line.strip() for line in script.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def write_asset(asset_dir, name, text, keep):
+    """Write a static asset under a content-hashed name and return its URL
+
+    site.css becomes site.<hash>.css, so browsers can cache it for good and
+    a new build only changes the name when the content changes. The file
+    name is added to keep for remove_stale_assets().
+    """
+    data = text.encode("utf-8")
+    STATS.count("output_bytes", len(data))
+    stem, suffix = os.path.splitext(name)
+    file_name = f"{stem}.{hashlib.sha1(data).hexdigest()[:12]}{suffix}"
+    asset_file = asset_dir / file_name
+    if not asset_file.exists():
+        asset_file.write_bytes(data)
+    keep.add(file_name)
+    return f"{ASSET_DIR_NAME}/{file_name}"
+
+
+def remove_stale_assets(asset_dir, keep):
+    """Delete assets (and their .gz siblings) from earlier builds
+
+    Only files named like write_asset() output are touched, so anything else
+    kept in asset_dir survives.
+    """
+    for asset_file in asset_dir.iterdir():
+        if (
+            ASSET_FILE.fullmatch(asset_file.name)
+            and asset_file.name.removesuffix(".gz") not in keep
+            and asset_file.is_file()
+        ):
+            asset_file.unlink()
+
+
+def gzip_path(path):
+    return path.with_name(path.name + ".gz")
 
-def render_hierarchy(hierarchy, site_name, level=0):
-    """Recursively render hierarchical page structure"""
-    html = ""
 
-    for domain, data in hierarchy.items():
-        if data["pages"]:
-            html += '<ul class="page-list">\n'
-            for page in sorted(data["pages"], key=lambda x: x.get("Title", "")):
-                title = page.get("Title", "Untitled")
-                url = page.get("URL", "#")
-                depth = page.get("Depth", "N/A")
-                local_file = page.get("Local File", "")
+def sync_gzip(paths, compress):
+    """Bring the .gz siblings of the output files in line with them
+
+    With compress, a sibling is (re)written when it is missing or older than
+    its file, so unchanged shards and assets keep theirs. Without it, stale
+    siblings are deleted so a server preferring precompressed files can't
+    serve an old build. Returns the number of compressed bytes written.
+    """
+    written = 0
+    for path in paths:
+        gz_file = gzip_path(path)
+        if not compress:
+            gz_file.unlink(missing_ok=True)
+            continue
+        try:
+            if gz_file.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        # mtime=0 and no file name keep the output reproducible
+        with open(path, "rb") as src, open(gz_file, "wb") as raw:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as out:
+                shutil.copyfileobj(src, out, 1 << 20)
+            written += raw.tell()
+    return written
+
+
+def add_search_entry(entries, section_no, page):
+    """Record a rendered page for the search index and return its element id"""
+    STATS.count("pages_rendered")
+    entries.append(page)
+    return f"p{section_no}-{len(entries) - 1}"
+
+
+def tokenize(text):
+    """Split text into lowercase search terms"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def build_search_index(entries):
+    """Build an inverted index over the Title, URL and Category of a section's pages
+
+    Documents are numbered in render order within the section, so document
+    n is the page with element id p<section>-<n>. Terms are sorted for
+    prefix lookups by binary search and posting lists are delta-encoded to
+    keep the JSON small.
+    """
+    postings = defaultdict(list)
+    for doc_no, page in enumerate(entries):
+        terms = set(tokenize(page.title))
+        terms.update(tokenize(page.url))
+        terms.update(tokenize(page.category or page.folder))
+        for term in terms:
+            postings[term].append(doc_no)
+
+    terms = sorted(postings)
+    encoded = []
+    for term in terms:
+        previous = 0
+        deltas = []
+        for doc_no in postings[term]:
+            deltas.append(doc_no - previous)
+            previous = doc_no
+        encoded.append(deltas)
+
+    return {"terms": terms, "postings": encoded}
+
+
+def write_search_index(index_file, sections):
+    """Write the search index and return its URL relative to index.html
+
+    sections lists [site_name, page_count, index] per section in page order,
+    index being its build_search_index() already encoded as JSON. Sections
+    are indexed separately so unchanged ones can keep their encoded index
+    from an earlier run (see iter_html()).
+    """
+    data = (
+        '{"sections":['
+        + ",".join(
+            f"[{json.dumps(name)},{count},{index}]" for name, count, index in sections
+        )
+        + "]}"
+    ).encode("utf-8")
+    STATS.count("output_bytes", len(data))
+    replace_file(Path(index_file), data)
+    return f"{Path(index_file).name}?v={hashlib.sha1(data).hexdigest()[:12]}"
+
+
+def fulltext_documents(site_data, root):
+    """(path, title, url, stat) for each distinct markdown file behind a site's pages
+
+    Relative local files are resolved against root, like snapshot_sites()
+    does. Pages sharing a file (TeamDynamix category files) make a single
+    document, titled by their category. Missing files are skipped.
+    """
+    seen = set()
+    for page in site_data["pages"]:
+        local_file = page.local_file
+        if not local_file or local_file in seen:
+            continue
+        seen.add(local_file)
+        path = os.path.join(root, local_file)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if S_ISREG(st.st_mode):
+            yield path, page.category or page.title, page.url or "#", st
+
+
+def fulltext_key(documents):
+    """Hash of everything a site's full-text shard depends on"""
+    digest = hashlib.sha1()
+    for path, title, url, st in documents:
+        record = f"{path}\x1f{title}\x1f{url}\x1f{st.st_mtime_ns}\x1f{st.st_size}\x1e"
+        digest.update(record.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def markdown_excerpt(text):
+    """Start of a markdown body as plain text, for search result snippets"""
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            text = text[end + 4 :]
+    text = MARKDOWN_LINK.sub(r"\1", text[: FULLTEXT_EXCERPT_CHARS * 2])
+    return MARKDOWN_MARKUP.sub(" ", text).strip()[:FULLTEXT_EXCERPT_CHARS]
+
+
+def encode_postings(values):
+    """Encode interleaved (doc, term frequency) pairs as base64 varints
+
+    Document numbers are delta-encoded first, so most values fit one byte.
+    """
+    deltas = list(values)
+    deltas[2::2] = map(int.__sub__, values[2::2], values[0:-2:2])
+    if max(deltas) < 128:
+        data = bytes(deltas)
+    else:
+        data = bytearray()
+        for value in deltas:
+            while value >= 128:
+                data.append(value & 127 | 128)
+                value >>= 7
+            data.append(value)
+    return base64.b64encode(data).decode("ascii")
+
+
+def spill_run(postings):
+    """Write buffered postings to a temporary file sorted by term, one line each"""
+    run = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for term in sorted(postings):
+        run.write(f"{term}\t{' '.join(map(str, postings[term]))}\n")
+    run.seek(0)
+    STATS.count("fulltext_runs")
+    return run
+
+
+def read_run(run):
+    """(term, [doc, tf, ...]) pairs of a spilled run, in term order"""
+    with run:
+        for line in run:
+            term, _, values = line.rstrip("\n").partition("\t")
+            yield term, list(map(int, values.split()))
+
+
+def write_fulltext_shard(shard_file, documents, io_workers=None):
+    """Index the bodies of a site's documents into shard_file
+
+    The shard is {"docs": [[title, url, file name, length, excerpt], ...],
+    "index": [term, postings, term, postings, ...]} with terms sorted and
+    postings encoded by encode_postings(). It is built in a single streaming
+    pass: documents are read ahead by prefetch() and written out as they are
+    tokenized, postings are buffered up to FULLTEXT_RUN_POSTINGS and then
+    spilled as sorted runs, and the runs are merged with heapq.merge() while
+    the index is written. Returns (document count, total length in terms,
+    space-separated FULLTEXT_PREFIX_CHARS prefixes of the terms).
+    """
+    postings = defaultdict(list)
+    buffered = 0
+    runs = []
+    doc_count = total_length = 0
+    prefixes = set()
+    tmp_file = shard_file.with_name(shard_file.name + ".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as out:
+        out.write('{"docs":[')
+        paths = [Path(document[0]) for document in documents]
+        for (path, title, url, _), fetch in zip(
+            documents, prefetch(read_text, paths, io_workers)
+        ):
+            try:
+                text = fetch()
+            except (OSError, UnicodeDecodeError):
+                continue
+            STATS.count("files_read")
+            STATS.count("bytes_read", len(text))
+            terms = Counter(TOKEN_PATTERN.findall(text.lower()))
+            length = sum(terms.values())
+            for term, frequency in terms.items():
+                postings[term] += (doc_count, frequency)
+            buffered += len(terms)
+            if buffered >= FULLTEXT_RUN_POSTINGS:
+                runs.append(spill_run(postings))
+                postings = defaultdict(list)
+                buffered = 0
+
+            record = [
+                title,
+                url,
+                os.path.basename(path),
+                length,
+                markdown_excerpt(text),
+            ]
+            out.write(
+                ("," if doc_count else "") + json.dumps(record, ensure_ascii=False)
+            )
+            doc_count += 1
+            total_length += length
 
-                html += f"""
-                <li class="page-item">
-                    <div class="page-title">{title}</div>
-                    <a href="{url}" class="page-url" target="_blank">{url}</a>
-                    <div class="page-meta">Depth: {depth} | Local: {Path(local_file).name if local_file else 'N/A'}</div>
-                </li>
-"""
-            html += "</ul>\n"
+        if runs:
+            if postings:
+                runs.append(spill_run(postings))
+            merged = heapq.merge(*map(read_run, runs), key=itemgetter(0))
+        else:
+            merged = ((term, postings[term]) for term in sorted(postings))
+
+        out.write('],"index":[')
+        separator = ""
+        # Runs hold consecutive documents, so a term's parts join in order
+        for term, parts in groupby(merged, key=itemgetter(0)):
+            values = []
+            for _, part in parts:
+                values.extend(part)
+            term_json = json.dumps(term, ensure_ascii=False)
+            out.write(f'{separator}{term_json},"{encode_postings(values)}"')
+            separator = ","
+            prefixes.add(term[:FULLTEXT_PREFIX_CHARS])
+        out.write("]}")
+    os.replace(tmp_file, shard_file)
+    STATS.count("fulltext_docs", doc_count)
+    return doc_count, total_length, " ".join(sorted(prefixes))
+
+
+def fulltext_files(fulltext_dir):
+    """Names of the manifest in fulltext_dir and the shards it lists"""
+    names = {FULLTEXT_MANIFEST_NAME}
+    try:
+        with open(fulltext_dir / FULLTEXT_MANIFEST_NAME, "r", encoding="utf-8") as f:
+            names.update(shard_file_name(entry[2]) for entry in json.load(f)["sites"])
+    except (OSError, ValueError, LookupError, TypeError, AttributeError):
+        pass
+    return names
+
+
+def remove_stale_fulltext(fulltext_dir, keep):
+    """Delete index files (and their .gz siblings) from earlier builds
+
+    Only the files named by the manifest on disk are touched, so anything
+    else kept in fulltext_dir survives.
+    """
+    for name in fulltext_files(fulltext_dir) - keep:
+        path = fulltext_dir / name
+        path.unlink(missing_ok=True)
+        gzip_path(path).unlink(missing_ok=True)
+
+
+def write_fulltext_index(sites, docs_base, fulltext_dir, io_workers=None):
+    """Build the full-text index of every site's markdown and return its URL
+
+    Each site gets its own shard in fulltext_dir (see write_fulltext_shard()),
+    listed in FULLTEXT_MANIFEST_NAME as [site, display name, shard URL,
+    documents, total length, key, term prefixes] so the page can rank across
+    shards while only loading those with terms a query can match. Sites whose
+    key (documents, titles, URLs and file stamps) matches the previous
+    manifest keep their shard.
+    """
+    fulltext_dir.mkdir(exist_ok=True)
+    manifest_file = fulltext_dir / FULLTEXT_MANIFEST_NAME
+    generator = generator_fingerprint()
+    previous = {}
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("generator") == generator:
+            previous = {entry[0]: entry for entry in cached["sites"]}
+    except (OSError, ValueError):
+        pass
+
+    root = os.path.dirname(os.path.abspath(docs_base))
+    entries = []
+    keep = {FULLTEXT_MANIFEST_NAME}
+    for site_name, site_data in sites.items():
+        documents = list(fulltext_documents(site_data, root))
+        if not documents:
+            continue
+        key = fulltext_key(documents)
+        file_name = site_name.replace("/", "--") + ".json"
+        shard_file = fulltext_dir / file_name
+        entry = previous.get(site_name)
+        if entry is None or entry[5] != key or not shard_file.exists():
+            with STATS.site(site_name):
+                doc_count, total_length, prefixes = write_fulltext_shard(
+                    shard_file, documents, io_workers
+                )
+            url = f"{FULLTEXT_DIR_NAME}/{file_name}?v={hash_file(shard_file)[:12]}"
+            entry = [
+                site_name,
+                format_site_name(site_name),
+                url,
+                doc_count,
+                total_length,
+                key,
+                prefixes,
+            ]
+        else:
+            STATS.count("fulltext_sites_reused")
+        entries.append(entry)
+        keep.add(file_name)
 
-        # Render children
-        if data["children"]:
-            for child_name, child_data in sorted(data["children"].items()):
-                subsection_id = f"subsection-{site_name}-{child_name}-{level}"
-                html += f"""
+    remove_stale_fulltext(fulltext_dir, keep)
+
+    data = json.dumps(
+        {"generator": generator, "sites": entries}, separators=(",", ":")
+    ).encode("utf-8")
+    manifest_file.write_bytes(data)
+    version = hashlib.sha1(data).hexdigest()[:12]
+    return f"{FULLTEXT_DIR_NAME}/{FULLTEXT_MANIFEST_NAME}?v={version}"
+
+
+WHATS_NEW_ITEM = Template(
+    """
+                            <li class="page-item">
+                                <div class="page-title">{title}</div>
+                                {link}
+                                <div class="page-meta">{meta}</div>
+                            </li>
+""",
+    raw=("link",),
+)
+WHATS_NEW_LINK = Template('<a href="{url}" class="page-url" target="_blank">{url}</a>')
+# Pages without a URL are keyed by their local file, shown without a link
+WHATS_NEW_PATH = Template('<div class="page-url">{url}</div>')
+
+
+def render_whats_new(delta, write):
+    """Render a crawl_delta() result as a collapsible "What's new" section"""
+    totals = delta["totals"]
+    if delta["baseline"]:
+        summary = "First snapshot, changes are listed from the next run on"
+    else:
+        summary = (
+            f"{totals['added']} added | {totals['removed']} removed | "
+            f"{totals['modified']} modified since {delta['previous_run']}"
+        )
+    write(f"""
+        <div class="site-section whats-new" data-site="whats-new">
+            <div class="site-header" onclick="toggleSite('whats-new')">
+                <div>
+                    <h2>What's New<span class="badge">{sum(totals.values())} changes</span></h2>
+                    <div class="site-meta">{summary}</div>
+                </div>
+                <span class="toggle-icon">▼</span>
+            </div>
+            <div class="site-content" id="content-whats-new">
+""")
+    for site_no, (site_name, changes) in enumerate(delta["sites"].items()):
+        subsection_id = f"whats-new-{site_no}"
+        change_count = sum(len(entries) for entries in changes.values())
+        write(f"""
                 <div class="subsection">
                     <div class="subsection-header" onclick="toggleSubsection('{subsection_id}')">
-                        <span>▶</span> {child_name.replace('-', ' ').title()}
+                        <span>▶</span> {format_site_name(site_name)} <span class="badge">{change_count} changes</span>
                     </div>
                     <div class="subsection-content" id="{subsection_id}">
-"""
-                html += render_hierarchy({child_name: child_data}, site_name, level + 1)
-                html += """
+                        <ul class="page-list">
+""")
+        for kind in ("added", "modified", "removed"):
+            entries = changes[kind]
+            for entry in entries[:WHATS_NEW_LIMIT]:
+                url = entry["url"]
+                link = (WHATS_NEW_LINK if "://" in url else WHATS_NEW_PATH).render(
+                    url=url
+                )
+                meta = kind.title()
+                if entry.get("changed"):
+                    meta += ": " + ", ".join(entry["changed"])
+                write(WHATS_NEW_ITEM.render(title=entry["title"], link=link, meta=meta))
+            if len(entries) > WHATS_NEW_LIMIT:
+                write(f"""
+                            <li class="page-item">
+                                <div class="page-meta">... and {len(entries) - WHATS_NEW_LIMIT} more {kind}, see {DELTA_REPORT_NAME}</div>
+                            </li>
+""")
+        write("""
+                        </ul>
+                    </div>
+                </div>
+""")
+    write("""
+            </div>
+        </div>
+""")
+
+
+def render_sections(jobs, workers=1):
+    """Render sections from render_section_job() argument tuples
+
+    Returns an iterator of zero-argument result getters in the same order as
+    jobs. With more than one worker the sections are rendered in a process
+    pool, at most 2 * workers ahead of the consumer, so finished sections
+    are written out while later ones are still rendering.
+    """
+    if workers <= 1 or len(jobs) < 2:
+        return (partial(render_section_job, *job) for job in jobs)
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(jobs)))
+    return run_ahead(
+        executor, (partial(render_section_job, *job) for job in jobs), 2 * workers
+    )
+
+
+def render_section_job(
+    section_no, site_name, site_data, children, virtual=False, order=False, search=False
+):
+    """Render one site section's content under a fresh BuildStats
+
+    Returns (content, page count, order, search index, phases, sites). The
+    content is the encoded render_section() markup, or the section_tree()
+    JSON with virtual=True. With order=True the rendered pages are also
+    given as positions in section_pages(), for the section cache, and with
+    search=True the section's build_search_index() is included, encoded.
+    Like profile_scan_site(), this runs the same in-process or in a pool
+    worker, and the counters are merged back by the caller.
+    """
+    global STATS
+    parent_stats, STATS = STATS, BuildStats()
+    try:
+        started = time.perf_counter()
+        parts = []
+        entries = []
+        page_id = partial(add_search_entry, entries, section_no)
+        with STATS.phase("render_html"):
+            if virtual:
+                parts.append(
+                    section_json(section_tree(site_name, site_data, children, page_id))
+                )
+            else:
+                render_section(site_name, site_data, children, parts.append, page_id)
+            content = "".join(parts).encode("utf-8")
+
+        positions = None
+        if order:
+            index = {
+                id(page): i for i, page in enumerate(section_pages(site_data, children))
+            }
+            positions = [index[id(page)] for page in entries]
+        search_index = None
+        if search:
+            with STATS.phase("search_index"):
+                search_index = json.dumps(
+                    build_search_index(entries), separators=(",", ":")
+                )
+        STATS.record_site(site_name, render_seconds=time.perf_counter() - started)
+        return content, len(entries), positions, search_index, STATS.phases, STATS.sites
+    finally:
+        STATS = parent_stats
+
+
+def render_section(site_name, site_data, children, write, page_id):
+    """Render a site section's content (everything below its header) into write()
+
+    children holds the (name, data) pairs of the sites nested under the
+    synthetic teamdynamix, gacounts and ets parents. page_id is called for
+    every rendered page and returns its element id.
+    """
+    # If this is teamdynamix parent, render children as subsections
+    if site_name == "teamdynamix":
+        for child_name, child_data in children:
+            child_display_name = format_site_name(child_name)
+            child_page_count = len(child_data["pages"])
+
+            write(f"""
+                <div class="subsection">
+                    <div class="subsection-header" onclick="toggleSubsection('content-{child_name}')">
+                        <span>▶</span> {child_display_name} <span class="badge">{child_page_count} pages</span>
+                    </div>
+                    <div class="subsection-content" id="content-{child_name}">
+""")
+            # Render child pages as flat list (no hierarchy for TeamDynamix)
+            write('<ul class="page-list">\n')
+            for page in child_data["pages"]:
+                write(
+                    render_page_item(
+                        PAGE_ITEM, page, page_id(page), "Source: TeamDynamix KB"
+                    )
+                )
+            write("</ul>\n")
+
+            write("""
+                    </div>
+                </div>
+""")
+    # If this is gacounts parent, render children as subsections
+    elif site_name == "gacounts":
+        for child_name, child_data in children:
+            child_display_name = format_site_name(child_name)
+            child_page_count = len(child_data["pages"])
+
+            write(f"""
+                <div class="subsection">
+                    <div class="subsection-header" onclick="toggleSubsection('content-{child_name}')">
+                        <span>▶</span> {child_display_name} <span class="badge">{child_page_count} pages</span>
+                    </div>
+                    <div class="subsection-content" id="content-{child_name}">
+""")
+            # Render child pages as flat list
+            write('<ul class="page-list">\n')
+            for page in child_data["pages"]:
+                write(
+                    render_page_item(PAGE_ITEM, page, page_id(page), local_meta(page))
+                )
+            write("</ul>\n")
+
+            write("""
+                    </div>
+                </div>
+""")
+    # If this is ETS parent, render children as subsections
+    elif site_name == "ets":
+        for child_name, child_data in children:
+            child_display_name = format_site_name(child_name)
+            child_page_count = len(child_data["pages"])
+
+            write(f"""
+                <div class="subsection">
+                    <div class="subsection-header" onclick="toggleSubsection('content-{child_name}')">
+                        <span>▶</span> {child_display_name} <span class="badge">{child_page_count} pages</span>
+                    </div>
+                    <div class="subsection-content" id="content-{child_name}">
+""")
+            # Render child pages as flat list
+            write('<ul class="page-list">\n')
+            for page in child_data["pages"]:
+                write(
+                    render_page_item(PAGE_ITEM, page, page_id(page), local_meta(page))
+                )
+            write("</ul>\n")
+
+            write("""
+                    </div>
+                </div>
+""")
+    # Group pages by path hierarchy for better organization
+    elif site_name == "dropbox/intranet-files":
+        # Group by folder for intranet files
+        from collections import defaultdict
+
+        folders = defaultdict(list)
+        for page in site_data["pages"]:
+            folder = page.folder or "uncategorized"
+            folders[folder].append(page)
+
+        # Render each folder as a subsection
+        for folder_name in sorted(folders.keys()):
+            files = folders[folder_name]
+            # Format folder name
+            display_folder = folder_name.replace("_", " ").title()
+
+            write(f"""
+                <div class="subsection">
+                    <div class="subsection-header" onclick="toggleSubsection('content-dropbox-{folder_name}')">
+                        <span>▶</span> {display_folder} <span class="badge">{len(files)} files</span>
+                    </div>
+                    <div class="subsection-content" id="content-dropbox-{folder_name}">
+                        <ul class="page-list">
+""")
+            for page in files:
+                write(
+                    render_page_item(
+                        FOLDER_PAGE_ITEM,
+                        page,
+                        page_id(page),
+                        "Source: Dropbox Intranet Files",
+                    )
+                )
+            write("""
+                        </ul>
+                    </div>
+                </div>
+""")
+    elif site_name == "ets":
+        # ETS files are from Dropbox - render as flat list
+        write('<ul class="page-list">\n')
+        for page in site_data["pages"]:
+            write(
+                render_page_item(
+                    PAGE_ITEM, page, page_id(page), "Source: Dropbox (ETS Resources)"
+                )
+            )
+        write("</ul>\n")
+    else:
+        # Hierarchical display for websites
+        with STATS.phase("build_hierarchy"):
+            hierarchy = build_hierarchy(site_data["pages"])
+        render_hierarchy(hierarchy, site_name, write, page_id)
+
+
+SUBSECTION_CLOSE = """
                     </div>
                 </div>
 """
 
-    return html
 
+def render_hierarchy(hierarchy, site_name, write, page_id, level=0):
+    """Render hierarchical page structure into the write() sink
+
+    hierarchy maps names to finalized UrlTrie nodes, so pages and children
+    are already sorted. page_id is called for every rendered page and
+    returns its element id. The walk uses an explicit stack instead of
+    recursion, so arbitrarily deep URL trees render in one linear pass.
+    """
+    # Entries are either (node, level) to render or markup closing a subsection
+    stack = [(node, level) for node in reversed(hierarchy.values())]
+    while stack:
+        entry = stack.pop()
+        if isinstance(entry, str):
+            write(entry)
+            continue
+        node, level = entry
+
+        if node.pages:
+            write('<ul class="page-list">\n')
+            for page in node.pages:
+                write(
+                    render_page_item(
+                        HIERARCHY_PAGE_ITEM, page, page_id(page), hierarchy_meta(page)
+                    )
+                )
+            write("</ul>\n")
+
+        # Children are opened as they come off the stack; push them in reverse
+        # so they render in sorted order
+        for child_name, child in reversed(node.children.items()):
+            subsection_id = f"subsection-{site_name}-{child_name}-{level}"
+            stack.append(SUBSECTION_CLOSE)
+            stack.append((child, level + 1))
+            stack.append(f"""
+                <div class="subsection">
+                    <div class="subsection-header" onclick="toggleSubsection('{subsection_id}')">
+                        <span>▶</span> {child_name.replace('-', ' ').title()}
+                        <span class="badge">{child.count} pages</span>
+                    </div>
+                    <div class="subsection-content" id="{subsection_id}">
+""")
+
+
+def section_tree(site_name, site_data, children, page_id):
+    """A section's pages as nested lists for the page's virtual list
+
+    The structure mirrors render_section(): the section is a list of nodes
+    shown without a header, a node is [pages, groups], each group is [label,
+    count, unit, node] and each page is [title, url, meta] plus the name of
+    the site it duplicates if it was flagged. page_id is called in the same
+    order as render_section() calls it, which is the depth-first order of
+    the tree, so the page can number documents without storing ids.
+    """
+
+    def row(page, meta):
+        page_id(page)
+        fields = [page.title, page.url or "#", meta]
+        if page.duplicate_of is not None:
+            fields.append(format_site_name(page.duplicate_of))
+        return fields
+
+    if site_name in ("teamdynamix", "gacounts", "ets"):
+        groups = []
+        for child_name, child_data in children:
+            if site_name == "teamdynamix":
+                pages = [
+                    row(page, "Source: TeamDynamix KB") for page in child_data["pages"]
+                ]
+            else:
+                pages = [row(page, local_meta(page)) for page in child_data["pages"]]
+            groups.append(
+                [
+                    format_site_name(child_name),
+                    len(child_data["pages"]),
+                    "pages",
+                    [pages, []],
+                ]
+            )
+        return [[[], groups]]
+
+    if site_name == "dropbox/intranet-files":
+        folders = defaultdict(list)
+        for page in site_data["pages"]:
+            folders[page.folder or "uncategorized"].append(page)
+        groups = []
+        for folder_name in sorted(folders):
+            files = folders[folder_name]
+            pages = [row(page, "Source: Dropbox Intranet Files") for page in files]
+            groups.append(
+                [
+                    folder_name.replace("_", " ").title(),
+                    len(files),
+                    "files",
+                    [pages, []],
+                ]
+            )
+        return [[[], groups]]
+
+    with STATS.phase("build_hierarchy"):
+        hierarchy = build_hierarchy(site_data["pages"])
+    # Same explicit-stack walk as render_hierarchy(); each node's lists are
+    # created by its parent and filled in when it comes off the stack
+    nodes = [[[], []] for _ in hierarchy]
+    stack = list(zip(reversed(hierarchy.values()), reversed(nodes)))
+    while stack:
+        trie, (pages, groups) = stack.pop()
+        for page in trie.pages:
+            pages.append(row(page, hierarchy_meta(page)))
+        children = []
+        for child_name, child in trie.children.items():
+            node = [[], []]
+            groups.append(
+                [child_name.replace("-", " ").title(), child.count, "pages", node]
+            )
+            children.append((child, node))
+        stack.extend(reversed(children))
+    return nodes
+
+
+def section_json(tree):
+    """Encode a section_tree(), safe to inline in a <script> element"""
+    return json.dumps(tree, ensure_ascii=False, separators=(",", ":")).replace(
+        "</", "<\\/"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate the CAES Chatbot crawled content documentation site"
+    )
+    parser.add_argument(
+        "--docs-dir",
+        type=Path,
+        default=DOCS_BASE,
+        help="Directory containing the crawl output (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=OUTPUT_DIR,
+        help="Directory index.html is written to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help="Write each site's pages to a separate file loaded on first expand",
+    )
+    parser.add_argument(
+        "--virtual-lists",
+        action="store_true",
+        help="Emit page lists as JSON rendered by a virtual scroller, for very large sites",
+    )
+    parser.add_argument(
+        "--fulltext",
+        action="store_true",
+        help=f"Index the markdown page content for full-text search, in {FULLTEXT_DIR_NAME}/",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help=f"Minify the markup and move the CSS/JS to hashed files in {ASSET_DIR_NAME}/",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write a .gz copy of every generated file for precompressed serving",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-parse sites whose source files changed since the last run",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes parsing site directories and rendering sections (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=IO_WORKERS,
+        help=(
+            "Threads reading markdown files ahead of the parser "
+            f"(1 = no read-ahead, default {IO_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time and I/O counters per phase and for the slowest sites",
+    )
+    parser.add_argument(
+        "--stats-json",
+        type=Path,
+        help="Write per-phase and per-site timings and counters to this JSON file",
+    )
+    parser.add_argument(
+        "--dedupe",
+        choices=["flag", "collapse"],
+        help="Mark (flag) or drop (collapse) pages listed more than once across "
+        f"sites and write a {DUPLICATES_REPORT_NAME} report",
+    )
+    parser.add_argument(
+        "--host-alias",
+        action="append",
+        default=[],
+        metavar="HOST=CANONICAL",
+        help="Treat HOST as CANONICAL when comparing URLs for --dedupe (repeatable)",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help=f"Compare pages with the previous run and write {DELTA_REPORT_NAME}; "
+        "with --shards, unchanged sections are not rendered again",
+    )
+    parser.add_argument(
+        "--whats-new",
+        action="store_true",
+        help='Add a "What\'s new" section listing the changes (implies --delta)',
+    )
+    parser.add_argument(
+        "--snapshot-file",
+        type=Path,
+        default=SNAPSHOT_FILE,
+        help="Page snapshot used by --delta (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        default=CACHE_FILE,
+        help="Manifest used by --incremental (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate when crawl files change "
+        "(with --shards only the changed sections are re-rendered)",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help="Seconds between checks for changes with --watch (default: %(default)s)",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_host_aliases(values):
+    """HOST_ALIASES extended with the HOST=CANONICAL pairs given on the command line"""
+    host_aliases = dict(HOST_ALIASES)
+    for alias in values:
+        host, sep, canonical = alias.partition("=")
+        if not sep or not host or not canonical:
+            sys.exit(f"Invalid --host-alias {alias!r}, expected HOST=CANONICAL")
+        host_aliases[host.strip().lower()] = canonical.strip().lower()
+    return host_aliases
+
+
+def print_stats(stats, top_sites=10):
+    """Print the --profile summary table"""
+    columns = [
+        ("seconds", "time (s)"),
+        ("files_read", "files"),
+        ("bytes_read", "read (KiB)"),
+        ("regex_calls", "regex"),
+        ("pages_emitted", "pages"),
+        ("output_bytes", "out (KiB)"),
+    ]
+
+    def row(name, counters, seconds_key="seconds"):
+        cells = []
+        for key, _ in columns:
+            value = counters.get(seconds_key if key == "seconds" else key, 0)
+            if key == "seconds":
+                cells.append(f"{value:>12.3f}")
+            elif key.endswith("bytes") or key == "bytes_read":
+                cells.append(f"{value / 1024:>12,.0f}")
+            else:
+                cells.append(f"{value:>12,.0f}")
+        print(f"  {name[:40]:<40}" + "".join(cells))
+
+    header = f"  {'':<40}" + "".join(f"{label:>12}" for _, label in columns)
+    print("\nPhases:")
+    print(header)
+    for name, counters in stats.phases.items():
+        # Rendered pages are reported in the pages column for render phases
+        if "pages_rendered" in counters:
+            counters = dict(counters, pages_emitted=counters["pages_rendered"])
+        row(name, counters)
+
+    for title, key in (("parse", "seconds"), ("render", "render_seconds")):
+        slowest = sorted(
+            (item for item in stats.sites.items() if key in item[1]),
+            key=lambda item: item[1][key],
+            reverse=True,
+        )[:top_sites]
+        if slowest:
+            print(f"\nSlowest sites to {title}:")
+            print(header)
+            for name, counters in slowest:
+                if key == "render_seconds":
+                    counters = dict(counters, pages_emitted=counters["pages_rendered"])
+                row(name, counters, key)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    host_aliases = parse_host_aliases(args.host_alias)
 
-def main():
     print("CAES Chatbot - Documentation Site Generator")
     print("=" * 60)
 
-    print(f"\nReading crawl data from: {DOCS_BASE}")
-    sites = read_crawl_data()
-
-    print(f"\nFound {len(sites)} sites:")
-    for name, data in sites.items():
-        print(f"  - {format_site_name(name)}: {len(data['pages'])} pages")
-
-    print("\nGenerating HTML documentation...")
-    html = generate_html(sites)
+    manifest = None
+    if args.incremental:
+        with STATS.phase("manifest"):
+            manifest = load_manifest(args.cache_file)
+    elif args.watch:
+        # Kept in memory between polls, so only changed sites are re-parsed
+        manifest = {"generator": generator_fingerprint(), "sites": {}}
+    section_cache = {} if args.watch else None
+
+    try:
+        generate(args, host_aliases, manifest, section_cache)
+    except (OSError, ValueError) as error:
+        # The crawl may still be running, which is what the watcher waits out
+        if not args.watch:
+            raise
+        manifest["page"] = None
+        print(f"\nBuild failed, retrying while watching: {error}")
+    report_stats(args, started)
+    if args.watch:
+        watch(args, host_aliases, manifest, section_cache)
+
+
+def generate(args, host_aliases, manifest, section_cache, verbose=True):
+    """Read the crawl data and write the site for the parsed command line
+
+    manifest and section_cache carry incremental state from earlier runs
+    (see read_crawl_data() and iter_html()), or are None. With verbose=False
+    nothing is printed unless the output is regenerated. Returns whether it
+    was.
+    """
+    if verbose:
+        print(f"\nReading crawl data from: {args.docs_dir}")
+    workers = args.workers or os.cpu_count() or 1
+    sites = read_crawl_data(args.docs_dir, manifest, workers, args.io_workers)
+
+    if verbose:
+        print(f"\nFound {len(sites)} sites:")
+        for name, data in sites.items():
+            print(f"  - {format_site_name(name)}: {len(data['pages'])} pages")
+
+    output_file = args.output_dir / "index.html"
+
+    snapshot = delta = None
+    if args.delta or args.whats_new:
+        with STATS.phase("snapshot"):
+            previous = load_snapshot(args.snapshot_file)
+            snapshot = snapshot_sites(sites, args.docs_dir, previous)
+            delta = crawl_delta(previous, snapshot)
+            delta_file = args.output_dir / DELTA_REPORT_NAME
+            with open(delta_file, "w", encoding="utf-8") as f:
+                json.dump(delta, f, indent=2)
+        section_cache = previous["sections"] if previous else {}
+        if verbose:
+            if delta["baseline"]:
+                print(
+                    f"\nDelta: no previous snapshot, baseline recorded in {delta_file}"
+                )
+            else:
+                totals = delta["totals"]
+                print(
+                    f"\nDelta: {totals['added']} added, {totals['removed']} removed, "
+                    f"{totals['modified']} modified pages in "
+                    f"{len(delta['sites'])} sites, "
+                    f"written to {delta_file}"
+                )
+
+    if args.dedupe:
+        with STATS.phase("dedupe"):
+            sites, duplicates = dedupe_sites(sites, args.dedupe, host_aliases)
+            report_file = args.output_dir / DUPLICATES_REPORT_NAME
+            write_duplicates_report(report_file, duplicates, args.dedupe)
+        extra_pages = sum(len(group) - 1 for group in duplicates.values())
+        action = "Flagged" if args.dedupe == "flag" else "Collapsed"
+        if verbose:
+            print(
+                f"\n{action} {extra_pages} duplicate pages of {len(duplicates)} URLs, "
+                f"report written to {report_file}"
+            )
 
-    output_file = OUTPUT_DIR / "index.html"
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html)
+    fulltext_url = None
+    if args.fulltext:
+        # Markdown bodies can change without their site's sources changing, so
+        # the index is always checked; its URL changes whenever it does
+        with STATS.phase("fulltext"):
+            fulltext_url = write_fulltext_index(
+                sites,
+                args.docs_dir,
+                args.output_dir / FULLTEXT_DIR_NAME,
+                args.io_workers,
+            )
 
-    print(f"\n[OK] Documentation generated: {output_file}")
-    print(f"     Total pages indexed: {sum(len(s['pages']) for s in sites.values()):,}")
-    print("\nTo view locally: Open index.html in a web browser")
-    print("For GitHub Pages: Commit and push the GITPAGES directory")
+    if manifest is not None:
+        # Output settings are recorded too, so changing them forces a rebuild
+        output_options = {
+            "file": str(output_file),
+            "shards": args.shards,
+            "virtual_lists": args.virtual_lists,
+            "minify": args.minify,
+            "gzip": args.gzip,
+            "dedupe": args.dedupe,
+            "host_aliases": sorted(args.host_alias),
+            "whats_new": args.whats_new,
+            "fulltext": fulltext_url,
+        }
+        page_stamp = file_stamp(output_file)
+        unchanged = (
+            not manifest["reparsed"]
+            and not manifest["removed"]
+            and manifest.get("output") == output_options
+            # Any other run writing the page in between forces a rebuild
+            and page_stamp is not None
+            and manifest.get("page") == page_stamp
+            # Markdown files can change without their site's sources changing
+            and not (args.whats_new and delta["sites"])
+        )
+        manifest["output"] = output_options
+        # Watch polls that find nothing to do leave the saved manifest alone
+        if unchanged and args.incremental and verbose:
+            with STATS.phase("manifest"):
+                save_manifest(args.cache_file, manifest)
+        if verbose:
+            print(
+                f"\nIncremental: re-parsed {len(manifest['reparsed'])} of "
+                f"{len(manifest['sites'])} site directories"
+            )
+        if unchanged:
+            if snapshot is not None:
+                save_snapshot(args.snapshot_file, snapshot, section_cache)
+            if verbose:
+                print(f"\n[OK] No changes detected, keeping {output_file}")
+            return False
+
+    if not args.fulltext:
+        remove_generated_dir(args.output_dir / FULLTEXT_DIR_NAME, remove_stale_fulltext)
+
+    if verbose:
+        print("\nGenerating HTML documentation...")
+    write_html(
+        sites,
+        output_file,
+        shards=args.shards,
+        whats_new=delta if args.whats_new else None,
+        section_cache=section_cache,
+        minify=args.minify,
+        compress=args.gzip,
+        virtual=args.virtual_lists,
+        fulltext_url=fulltext_url,
+        workers=workers,
+    )
+    if manifest is not None:
+        # Only recorded once the page is complete, so a failed render rebuilds
+        manifest["page"] = file_stamp(output_file)
+        if args.incremental:
+            with STATS.phase("manifest"):
+                save_manifest(args.cache_file, manifest)
+    if snapshot is not None:
+        with STATS.phase("snapshot"):
+            save_snapshot(args.snapshot_file, snapshot, section_cache)
+
+    if verbose:
+        print(f"\n[OK] Documentation generated: {output_file}")
+        page_count = sum(len(site_data["pages"]) for site_data in sites.values())
+        print(f"     Total pages indexed: {page_count:,}")
+        print("\nTo view locally: Open index.html in a web browser")
+        print("For GitHub Pages: Commit and push the GITPAGES directory")
+    return True
+
+
+def watch(args, host_aliases, manifest, section_cache):
+    """Poll the docs tree and regenerate the site whenever crawl files change
+
+    Each poll walks the tree and compares every site's source fingerprints
+    with the in-memory manifest, so only sites with changed files are
+    re-parsed; with --shards, iter_html() also reuses the shards of
+    sections that didn't change. A poll that fails to read or write is
+    reported and retried on the next one. Runs until interrupted.
+    """
+    global STATS
+    print(
+        f"\nWatching {args.docs_dir} for changes every {args.watch_interval}s "
+        "(Ctrl+C to stop)"
+    )
+    try:
+        while True:
+            time.sleep(args.watch_interval)
+            STATS = BuildStats()
+            started = time.perf_counter()
+            try:
+                regenerated = generate(
+                    args, host_aliases, manifest, section_cache, verbose=False
+                )
+            except (OSError, ValueError) as error:
+                # Usually a crawl file caught halfway through being written;
+                # the current output stays up and the next poll tries again
+                manifest["page"] = None
+                print(f"[{datetime.now():%H:%M:%S}] Rebuild failed, retrying: {error}")
+                continue
+            if not regenerated:
+                continue
+            changed = manifest["reparsed"] + manifest["removed"]
+            elapsed = (time.perf_counter() - started) * 1000
+            print(
+                f"[{datetime.now():%H:%M:%S}] Regenerated for "
+                f"{', '.join(changed) or 'output changes'} in {elapsed:.0f}ms"
+            )
+            report_stats(args, started)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def report_stats(args, started):
+    """Print and/or save the instrumentation collected during this run"""
+    if args.profile:
+        print_stats(STATS)
+        print(f"\n  Total: {time.perf_counter() - started:.3f}s")
+    if args.stats_json:
+        report = dict(STATS.report(), total_seconds=time.perf_counter() - started)
+        with open(args.stats_json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Build statistics written to {args.stats_json}")
 
 
 if __name__ == "__main__":